@@ -1,16 +1,64 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+import logging
+import mimetypes
 import os
-import base64
-import uuid
+import re
+import stat
+from email.utils import formatdate
+from typing import Iterator
+try:
+    import pybase64 as _base64  # SIMD 加速的 base64 解码
+except ImportError:  # pragma: no cover - 回退到标准库
+    import base64 as _base64
 from app.api.deps import get_db
+from app.api.projects.crud import PROJECT_ID_REGEX
 from app.core.config import settings
 from app.models.projects import Project as ProjectModel
-from app.services.assets import write_bytes
+from app.services.assets import ensure_dir, write_bytes, write_stream
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/assets", tags=["assets"]) 
 
+_b64decode = _base64.b64decode
+
+# Upload type checks
+_ALLOWED_TYPE_PREFIXES = ('image/', 'text/plain', 'text/csv', 'application/csv')
+_CSV_TYPES = frozenset({'text/csv', 'application/csv'})
+_IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg'})
+_ALLOWED_EXTENSIONS = _IMAGE_EXTENSIONS | {'.txt', '.csv'}
+
+_PROJECTS_ROOT = settings.projects_root
+
+# Asset filenames must be a single, non-hidden path component
+_UNSAFE_FILENAME = re.compile(r"^\.|[/\\\x00]")
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+_O_NONBLOCK = getattr(os, "O_NONBLOCK", 0)
+_READ_CHUNK_SIZE = 256 * 1024
+
+
+def _iter_fd(fd: int) -> Iterator[bytes]:
+    """Read an already-opened file to EOF in chunks, closing the fd when done"""
+    with os.fdopen(fd, "rb") as f:
+        while chunk := f.read(_READ_CHUNK_SIZE):
+            yield chunk
+
+
+def _assets_dir(project_id: str) -> str:
+    # project_id must already be validated against PROJECT_ID_REGEX
+    return f"{_PROJECTS_ROOT}/{project_id}/assets"
+
+
+def _get_project_or_404(db: Session, project_id: str) -> ProjectModel:
+    row = db.get(ProjectModel, project_id) if PROJECT_ID_REGEX.match(project_id) else None
+    if not row:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return row
+
 
 class LogoRequest(BaseModel):
     b64_png: str  # Accept base64-encoded PNG (fallback if no OpenAI key)
@@ -18,77 +66,98 @@ class LogoRequest(BaseModel):
 
 @router.post("/{project_id}/logo")
 async def upload_logo(project_id: str, body: LogoRequest, db: Session = Depends(get_db)):
-    row = db.get(ProjectModel, project_id)
-    if not row:
-        raise HTTPException(status_code=404, detail="Project not found")
-    project_assets = os.path.join(settings.projects_root, project_id, "assets")
-    data = base64.b64decode(body.b64_png)
-    logo_path = os.path.join(project_assets, "logo.png")
+    """Upload project logo as base64 JSON (deprecated, prefer /logo/binary)"""
+    _get_project_or_404(db, project_id)
+    data = _b64decode(body.b64_png.encode("ascii"), validate=False)
+    logo_path = f"{_assets_dir(project_id)}/logo.png"
     write_bytes(logo_path, data)
-    return {"path": f"assets/logo.png"}
+    return {"path": "assets/logo.png"}
+
+
+@router.post("/{project_id}/logo/binary")
+async def upload_logo_binary(project_id: str, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Upload project logo as raw multipart binary, skipping base64 encoding"""
+    _get_project_or_404(db, project_id)
+    if not (file.content_type and file.content_type.startswith('image/')):
+        raise HTTPException(status_code=400, detail="Logo must be an image")
+    logo_path = f"{_assets_dir(project_id)}/logo.png"
+    await run_in_threadpool(write_stream, logo_path, file.file)
+    return {"path": "assets/logo.png"}
 
 
 @router.get("/{project_id}/{filename}")
-async def get_image(project_id: str, filename: str, db: Session = Depends(get_db)):
+async def get_image(project_id: str, filename: str, request: Request, db: Session = Depends(get_db)):
     """Get an image file from project assets directory"""
-    from fastapi.responses import FileResponse
-    
     # Verify project exists
-    row = db.get(ProjectModel, project_id)
-    if not row:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _get_project_or_404(db, project_id)
     
+    # Reject traversal / hidden names before touching the filesystem
+    if _UNSAFE_FILENAME.search(filename):
+        raise HTTPException(status_code=404, detail="Image not found")
+
     # Build file path
-    file_path = os.path.join(settings.projects_root, project_id, "assets", filename)
+    file_path = f"{_assets_dir(project_id)}/{filename}"
     
-    # Check if file exists
-    if not os.path.exists(file_path):
+    # Open once without following symlinks; O_NONBLOCK keeps a FIFO from blocking the loop.
+    # The body is streamed from this fd, so the checked file is the one that is served.
+    try:
+        fd = os.open(file_path, os.O_RDONLY | _O_NOFOLLOW | _O_NONBLOCK)
+    except OSError:
         raise HTTPException(status_code=404, detail="Image not found")
-    
+    try:
+        stat_result = os.fstat(fd)
+    except OSError:
+        os.close(fd)
+        raise HTTPException(status_code=404, detail="Image not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        os.close(fd)
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    # Short-circuit conditional requests
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if request.headers.get("if-none-match") == etag:
+        os.close(fd)
+        return Response(status_code=304, headers=headers)
+
     # Return the image file
-    return FileResponse(file_path)
+    headers["Content-Length"] = str(stat_result.st_size)
+    headers["Last-Modified"] = formatdate(stat_result.st_mtime, usegmt=True)
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return StreamingResponse(_iter_fd(fd), media_type=media_type, headers=headers)
 
 
 @router.post("/{project_id}/upload")
 async def upload_image(project_id: str, file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Upload a file (image, CSV, or TXT) to project assets directory"""
-    print(f"📤 File upload request: project_id={project_id}, filename={file.filename}")
+    logger.debug("File upload request: project_id=%s, filename=%s", project_id, file.filename)
 
     # Verify project exists
-    row = db.get(ProjectModel, project_id)
-    if not row:
-        print(f"❌ Project not found: {project_id}")
-        raise HTTPException(status_code=404, detail="Project not found")
+    _get_project_or_404(db, project_id)
 
     # Check if file type is supported (images, CSV, or TXT)
-    print(f"📁 File info: content_type={file.content_type}, size={file.size}")
-    allowed_types = ['image/', 'text/plain', 'text/csv', 'application/csv']
-    is_allowed = False
-
-    if file.content_type:
-        # Check content type
-        for allowed_type in allowed_types:
-            if file.content_type.startswith(allowed_type) or file.content_type == allowed_type:
-                is_allowed = True
-                break
+    logger.debug("File info: content_type=%s, size=%s", file.content_type, file.size)
+    is_allowed = bool(file.content_type and file.content_type.startswith(_ALLOWED_TYPE_PREFIXES))
 
     # Also check file extension as fallback
     if not is_allowed and file.filename:
         file_ext = os.path.splitext(file.filename)[1].lower()
-        if file_ext in ['.txt', '.csv', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg']:
-            is_allowed = True
+        is_allowed = file_ext in _ALLOWED_EXTENSIONS
 
     if not is_allowed:
-        print(f"❌ Invalid file type: {file.content_type}")
+        logger.debug("Invalid file type: %s", file.content_type)
         raise HTTPException(status_code=400, detail="File must be an image (PNG, JPG, GIF, WEBP, SVG), CSV, or TXT file")
     
     # Create assets directory if it doesn't exist
-    project_assets = os.path.join(settings.projects_root, project_id, "assets")
-    print(f"📁 Assets directory: {project_assets}")
-    os.makedirs(project_assets, exist_ok=True)
+    project_assets = _assets_dir(project_id)
+    logger.debug("Assets directory: %s", project_assets)
+    ensure_dir(project_assets)
 
     # Use original filename, handle conflicts with incremental numbering
     original_filename = file.filename or 'file.txt'
+    # Reject path separators / hidden names so the upload stays inside the assets directory
+    if _UNSAFE_FILENAME.search(original_filename):
+        raise HTTPException(status_code=400, detail="Invalid filename")
 
     # Get file name and extension
     name_without_ext, file_extension = os.path.splitext(original_filename)
@@ -97,33 +166,41 @@ async def upload_image(project_id: str, file: UploadFile = File(...), db: Sessio
     if not file_extension:
         if file.content_type and file.content_type.startswith('image/'):
             file_extension = '.png'
-        elif file.content_type in ['text/csv', 'application/csv']:
+        elif file.content_type in _CSV_TYPES:
             file_extension = '.csv'
         else:
             file_extension = '.txt'
         original_filename = f"{name_without_ext}{file_extension}"
 
     # Check for filename conflicts and add number suffix if needed
+    # (list the directory once instead of stat-ing every candidate)
+    try:
+        with os.scandir(project_assets) as entries:
+            existing_names = {entry.name for entry in entries}
+    except FileNotFoundError:
+        # Cached directory was removed; write_stream recreates it
+        existing_names = set()
+
     final_filename = original_filename
-    file_path = os.path.join(project_assets, final_filename)
     counter = 1
 
-    while os.path.exists(file_path):
+    while final_filename in existing_names:
         # Add (1), (2), etc. before extension
         final_filename = f"{name_without_ext}({counter}){file_extension}"
-        file_path = os.path.join(project_assets, final_filename)
         counter += 1
 
-    print(f"💾 Saving to: {file_path}")
+    file_path = f"{project_assets}/{final_filename}"
+
+    logger.debug("Saving to: %s", file_path)
     if counter > 1:
-        print(f"📝 Original filename existed, renamed to: {final_filename}")
+        logger.debug("Original filename existed, renamed to: %s", final_filename)
 
     # Determine file type
     file_type = 'unknown'
     if file.content_type:
         if file.content_type.startswith('image/'):
             file_type = 'image'
-        elif file.content_type in ['text/csv', 'application/csv']:
+        elif file.content_type in _CSV_TYPES:
             file_type = 'csv'
         elif file.content_type == 'text/plain':
             file_type = 'text'
@@ -131,7 +208,7 @@ async def upload_image(project_id: str, file: UploadFile = File(...), db: Sessio
     # Fallback to extension check
     if file_type == 'unknown':
         ext_lower = file_extension.lower()
-        if ext_lower in ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg']:
+        if ext_lower in _IMAGE_EXTENSIONS:
             file_type = 'image'
         elif ext_lower == '.csv':
             file_type = 'csv'
@@ -139,10 +216,9 @@ async def upload_image(project_id: str, file: UploadFile = File(...), db: Sessio
             file_type = 'text'
 
     try:
-        # Save file
-        content = await file.read()
-        write_bytes(file_path, content)
-        print(f"✅ File saved successfully: {len(content)} bytes, type: {file_type}")
+        # Save file (streamed in chunks to keep memory bounded)
+        size = await run_in_threadpool(write_stream, file_path, file.file)
+        logger.debug("File saved successfully: %d bytes, type: %s", size, file_type)
 
         return {
             "path": f"assets/{final_filename}",
@@ -153,5 +229,5 @@ async def upload_image(project_id: str, file: UploadFile = File(...), db: Sessio
             "content_type": file.content_type
         }
     except Exception as e:
-        print(f"❌ Failed to save file: {e}")
+        logger.exception("Failed to save file: %s", file_path)
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
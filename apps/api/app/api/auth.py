@@ -2,19 +2,41 @@
 用户授权管理 API 接口
 """
 from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 import logging
-
-from app.api.deps import get_db, verify_user_authorization, get_current_cert_fingerprint
+import re
+
+from app.api.deps import (
+    get_db,
+    get_current_cert_fingerprint,
+    lookup_authorized_user,
+    invalidate_authorized_user,
+)
 from app.models.authorized_users import AuthorizedUser
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+# 32位大写十六进制证书指纹
+_HEX32 = re.compile(r"[0-9A-F]{32}")
+
+# 列表接口只查询响应所需的列，跳过 ORM 对象构建
+_LIST_COLUMNS = (
+    AuthorizedUser.cert_fingerprint,
+    AuthorizedUser.user_name,
+    AuthorizedUser.user_email,
+    AuthorizedUser.is_active,
+    AuthorizedUser.remark,
+    AuthorizedUser.created_at,
+    AuthorizedUser.updated_at,
+)
+_MAX_LIST_LIMIT = 1000
+
 
 # Pydantic 模型定义
 class AuthorizedUserCreate(BaseModel):
@@ -24,8 +46,8 @@ class AuthorizedUserCreate(BaseModel):
     user_email: Optional[str] = Field(None, description="用户邮箱")
     remark: Optional[str] = Field(None, description="备注信息")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "cert_fingerprint": "8E0A8FC9011CEFE1AFD0B41FA60175FF",
                 "user_name": "张三",
@@ -33,6 +55,7 @@ class AuthorizedUserCreate(BaseModel):
                 "remark": "测试用户"
             }
         }
+    )
 
 
 class AuthorizedUserUpdate(BaseModel):
@@ -53,8 +76,7 @@ class AuthorizedUserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AuthCheckResponse(BaseModel):
@@ -66,8 +88,9 @@ class AuthCheckResponse(BaseModel):
 
 
 # API 路由
+# 以下接口均为同步数据库操作，使用普通 def 由 FastAPI 在线程池中执行，避免阻塞事件循环
 @router.post("/users", response_model=AuthorizedUserResponse, status_code=201)
-async def add_authorized_user(
+def add_authorized_user(
     body: AuthorizedUserCreate,
     db: Session = Depends(get_db)
 ):
@@ -78,16 +101,14 @@ async def add_authorized_user(
     """
     # 验证证书指纹格式（32位大写十六进制）
     cert_fingerprint = body.cert_fingerprint.upper()
-    if not all(c in '0123456789ABCDEF' for c in cert_fingerprint):
+    if not _HEX32.fullmatch(cert_fingerprint):
         raise HTTPException(
             status_code=400,
             detail="证书指纹格式无效，必须是32位十六进制字符串"
         )
 
     # 检查是否已存在
-    existing_user = db.query(AuthorizedUser).filter(
-        AuthorizedUser.cert_fingerprint == cert_fingerprint
-    ).first()
+    existing_user = db.get(AuthorizedUser, cert_fingerprint)
 
     if existing_user:
         raise HTTPException(
@@ -106,12 +127,15 @@ async def add_authorized_user(
         )
 
         db.add(new_user)
+        # flush 时数据库生成的时间戳已通过 RETURNING 回填，提交前构建响应，省去 refresh 的额外 SELECT
+        db.flush()
+        response = AuthorizedUserResponse.model_validate(new_user)
         db.commit()
-        db.refresh(new_user)
+        invalidate_authorized_user(cert_fingerprint)
 
         logger.info(f"Added authorized user: {cert_fingerprint} ({body.user_name})")
 
-        return new_user
+        return response
 
     except Exception as e:
         db.rollback()
@@ -123,7 +147,7 @@ async def add_authorized_user(
 
 
 @router.get("/check", response_model=AuthCheckResponse)
-async def check_user_permission(
+def check_user_permission(
     cert_fingerprint: str = Depends(get_current_cert_fingerprint),
     db: Session = Depends(get_db)
 ):
@@ -142,16 +166,13 @@ async def check_user_permission(
         )
 
     # 查询数据库
-    authorized_user = db.query(AuthorizedUser).filter(
-        AuthorizedUser.cert_fingerprint == cert_fingerprint,
-        AuthorizedUser.is_active == True
-    ).first()
+    authorized, user_name = lookup_authorized_user(db, cert_fingerprint)
 
-    if authorized_user:
+    if authorized:
         return AuthCheckResponse(
             authorized=True,
             cert_fingerprint=cert_fingerprint,
-            user_name=authorized_user.user_name,
+            user_name=user_name,
             message="用户已授权"
         )
     else:
@@ -164,7 +185,7 @@ async def check_user_permission(
 
 
 @router.get("/users", response_model=List[AuthorizedUserResponse])
-async def list_authorized_users(
+def list_authorized_users(
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
@@ -173,28 +194,26 @@ async def list_authorized_users(
     """
     获取授权用户列表
 
-    支持分页和按状态过滤
+    支持分页和按状态过滤，单页最多返回 1000 条
     """
-    query = db.query(AuthorizedUser)
+    stmt = select(*_LIST_COLUMNS)
 
     if is_active is not None:
-        query = query.filter(AuthorizedUser.is_active == is_active)
+        stmt = stmt.where(AuthorizedUser.is_active == is_active)
 
-    users = query.offset(skip).limit(limit).all()
-    return users
+    stmt = stmt.offset(skip).limit(min(limit, _MAX_LIST_LIMIT))
+    return [AuthorizedUserResponse(**row._mapping) for row in db.execute(stmt)]
 
 
 @router.get("/users/{cert_fingerprint}", response_model=AuthorizedUserResponse)
-async def get_authorized_user(
+def get_authorized_user(
     cert_fingerprint: str,
     db: Session = Depends(get_db)
 ):
     """
     获取指定授权用户信息
     """
-    user = db.query(AuthorizedUser).filter(
-        AuthorizedUser.cert_fingerprint == cert_fingerprint
-    ).first()
+    user = db.get(AuthorizedUser, cert_fingerprint)
 
     if not user:
         raise HTTPException(
@@ -206,7 +225,7 @@ async def get_authorized_user(
 
 
 @router.patch("/users/{cert_fingerprint}", response_model=AuthorizedUserResponse)
-async def update_authorized_user(
+def update_authorized_user(
     cert_fingerprint: str,
     body: AuthorizedUserUpdate,
     db: Session = Depends(get_db)
@@ -214,9 +233,7 @@ async def update_authorized_user(
     """
     更新授权用户信息
     """
-    user = db.query(AuthorizedUser).filter(
-        AuthorizedUser.cert_fingerprint == cert_fingerprint
-    ).first()
+    user = db.get(AuthorizedUser, cert_fingerprint)
 
     if not user:
         raise HTTPException(
@@ -235,12 +252,14 @@ async def update_authorized_user(
         if body.remark is not None:
             user.remark = body.remark
 
+        db.flush()
+        response = AuthorizedUserResponse.model_validate(user)
         db.commit()
-        db.refresh(user)
+        invalidate_authorized_user(cert_fingerprint)
 
         logger.info(f"Updated authorized user: {cert_fingerprint}")
 
-        return user
+        return response
 
     except Exception as e:
         db.rollback()
@@ -252,16 +271,14 @@ async def update_authorized_user(
 
 
 @router.delete("/users/{cert_fingerprint}", status_code=204)
-async def delete_authorized_user(
+def delete_authorized_user(
     cert_fingerprint: str,
     db: Session = Depends(get_db)
 ):
     """
     删除授权用户
     """
-    user = db.query(AuthorizedUser).filter(
-        AuthorizedUser.cert_fingerprint == cert_fingerprint
-    ).first()
+    user = db.get(AuthorizedUser, cert_fingerprint)
 
     if not user:
         raise HTTPException(
@@ -272,6 +289,7 @@ async def delete_authorized_user(
     try:
         db.delete(user)
         db.commit()
+        invalidate_authorized_user(cert_fingerprint)
 
         logger.info(f"Deleted authorized user: {cert_fingerprint}")
 
@@ -1,7 +1,10 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from fastapi import Header, HTTPException, Depends, Request
-from typing import Annotated
+from fastapi import HTTPException, Depends, Request
+from starlette.concurrency import run_in_threadpool
 import logging
+import threading
+import time
 
 from app.db.session import SessionLocal
 from app.models.authorized_users import AuthorizedUser
@@ -9,6 +12,83 @@ from app.utils.cert_utils import get_md5_cert
 
 logger = logging.getLogger(__name__)
 
+# 证书请求头名称（ASGI 中请求头名已统一为小写）
+# HTTP 标准使用连字符，但有些中间件可能使用下划线
+_KYC_CERT_HEADERS = frozenset({b"kyc-client-cert", b"kyc_client_cert"})
+
+
+def _get_kyc_client_cert(request: Request) -> str | None:
+    """单次遍历原始请求头，获取客户端证书"""
+    for name, value in request.scope["headers"]:
+        if name in _KYC_CERT_HEADERS and value:
+            return value.decode("latin-1")
+    return None
+
+
+# 授权用户查询缓存：cert_fingerprint -> (过期时间, (是否授权, 用户名))
+# 授权用户数量少且变更不频繁，增删改接口会主动失效对应条目
+_AUTH_CACHE_TTL = 60.0
+_AUTH_CACHE_MAXSIZE = 1024
+_auth_cache: dict[str, tuple[float, tuple[bool, str | None]]] = {}
+# 失效代数：cert_fingerprint -> 失效次数，查询期间发生失效则不回写缓存
+# 只有授权用户管理接口会失效，条目数与授权用户数量同级
+_auth_cache_generations: dict[str, int] = {}
+_auth_cache_lock = threading.Lock()
+
+
+def _get_cached_authorization(cert_fingerprint: str) -> tuple[bool, str | None] | None:
+    """读取未过期的缓存结果，未命中返回 None"""
+    with _auth_cache_lock:
+        cached = _auth_cache.get(cert_fingerprint)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+def lookup_authorized_user(db: Session, cert_fingerprint: str) -> tuple[bool, str | None]:
+    """
+    查询证书指纹对应的启用用户（带 TTL 缓存）
+
+    同步查询数据库，异步调用方应通过线程池执行
+
+    Returns:
+        (是否授权, 用户名)
+    """
+    cached = _get_cached_authorization(cert_fingerprint)
+    if cached is not None:
+        return cached
+
+    with _auth_cache_lock:
+        generation = _auth_cache_generations.get(cert_fingerprint, 0)
+
+    authorized_user = db.execute(
+        select(AuthorizedUser).where(
+            AuthorizedUser.cert_fingerprint == cert_fingerprint,
+            AuthorizedUser.is_active == True
+        )
+    ).scalar_one_or_none()
+    result = (True, authorized_user.user_name) if authorized_user else (False, None)
+
+    now = time.monotonic()
+    with _auth_cache_lock:
+        # 查询期间条目已被失效，结果可能是旧数据，不回写
+        if _auth_cache_generations.get(cert_fingerprint, 0) != generation:
+            return result
+        if len(_auth_cache) >= _AUTH_CACHE_MAXSIZE:
+            for key in [k for k, (expires, _) in _auth_cache.items() if expires <= now]:
+                del _auth_cache[key]
+            if len(_auth_cache) >= _AUTH_CACHE_MAXSIZE:
+                del _auth_cache[next(iter(_auth_cache))]
+        _auth_cache[cert_fingerprint] = (now + _AUTH_CACHE_TTL, result)
+    return result
+
+
+def invalidate_authorized_user(cert_fingerprint: str) -> None:
+    """授权用户变更后失效缓存"""
+    with _auth_cache_lock:
+        _auth_cache.pop(cert_fingerprint, None)
+        _auth_cache_generations[cert_fingerprint] = _auth_cache_generations.get(cert_fingerprint, 0) + 1
+
 
 def get_db():
     """Database session dependency"""
@@ -19,20 +99,40 @@ def get_db():
         db.close()
 
 
+async def get_current_cert_fingerprint(
+    request: Request
+) -> str | None:
+    """
+    获取当前请求的证书指纹（不验证权限）
+    用于管理接口等不需要权限验证的场景
+    支持以下请求头格式（大小写不敏感）：
+    - kyc-client-cert (推荐，HTTP标准)
+    - kyc_client_cert (兼容格式)
+
+    Args:
+        request: FastAPI 请求对象
+
+    Returns:
+        证书指纹，如果证书不存在或解析失败则返回 None
+    """
+    kyc_client_cert = _get_kyc_client_cert(request)
+
+    if not kyc_client_cert:
+        return None
+
+    return get_md5_cert(kyc_client_cert)
+
+
 async def verify_user_authorization(
-    request: Request,
+    cert_fingerprint: str | None = Depends(get_current_cert_fingerprint),
     db: Session = Depends(get_db)
 ) -> str:
     """
     验证用户是否有权限访问系统
-    从请求头中获取证书并验证
-    支持以下请求头格式：
-    - kyc-client-cert (推荐，HTTP标准)
-    - kyc_client_cert (兼容格式)
-    - Kyc-Client-Cert (大小写不敏感)
+    复用 get_current_cert_fingerprint 解析的证书指纹，同一请求内只解析一次
 
     Args:
-        request: FastAPI 请求对象
+        cert_fingerprint: 当前请求的证书指纹
         db: 数据库会话
 
     Returns:
@@ -41,74 +141,26 @@ async def verify_user_authorization(
     Raises:
         HTTPException: 如果证书无效或用户未授权
     """
-    # 尝试从不同格式的请求头中获取证书
-    # HTTP 标准使用连字符，但有些中间件可能使用下划线
-    kyc_client_cert = (
-        request.headers.get("kyc-client-cert") or
-        request.headers.get("kyc_client_cert") or
-        request.headers.get("Kyc-Client-Cert")
-    )
-
-    # 检查证书是否存在
-    if not kyc_client_cert:
-        logger.warning("Request without kyc_client_cert header")
-        raise HTTPException(
-            status_code=401,
-            detail="客户端证书缺失，请提供有效的证书"
-        )
-
-    # 解析证书指纹
-    cert_fingerprint = get_md5_cert(kyc_client_cert)
-
+    # 检查证书是否存在且可解析
     if not cert_fingerprint:
-        logger.warning("Failed to parse certificate")
+        logger.warning("Request without a valid kyc_client_cert header")
         raise HTTPException(
             status_code=401,
-            detail="证书格式无效，无法解析"
+            detail="客户端证书缺失或格式无效，请提供有效的证书"
         )
 
-    # 查询数据库验证权限
-    authorized_user = db.query(AuthorizedUser).filter(
-        AuthorizedUser.cert_fingerprint == cert_fingerprint,
-        AuthorizedUser.is_active == True
-    ).first()
+    # 查询数据库验证权限（缓存未命中时在线程池中查询，避免阻塞事件循环）
+    cached = _get_cached_authorization(cert_fingerprint)
+    if cached is None:
+        cached = await run_in_threadpool(lookup_authorized_user, db, cert_fingerprint)
+    authorized, user_name = cached
 
-    if not authorized_user:
+    if not authorized:
         logger.warning(f"Unauthorized access attempt with fingerprint: {cert_fingerprint}")
         raise HTTPException(
             status_code=403,
             detail="您没有权限访问此系统，请联系管理员"
         )
 
-    logger.info(f"User authorized: {authorized_user.user_name or cert_fingerprint}")
+    logger.info(f"User authorized: {user_name or cert_fingerprint}")
     return cert_fingerprint
-
-
-async def get_current_cert_fingerprint(
-    request: Request
-) -> str | None:
-    """
-    获取当前请求的证书指纹（不验证权限）
-    用于管理接口等不需要权限验证的场景
-    支持以下请求头格式：
-    - kyc-client-cert (推荐，HTTP标准)
-    - kyc_client_cert (兼容格式)
-    - Kyc-Client-Cert (大小写不敏感)
-
-    Args:
-        request: FastAPI 请求对象
-
-    Returns:
-        证书指纹，如果证书不存在或解析失败则返回 None
-    """
-    # 尝试从不同格式的请求头中获取证书
-    kyc_client_cert = (
-        request.headers.get("kyc-client-cert") or
-        request.headers.get("kyc_client_cert") or
-        request.headers.get("Kyc-Client-Cert")
-    )
-
-    if not kyc_client_cert:
-        return None
-
-    return get_md5_cert(kyc_client_cert)
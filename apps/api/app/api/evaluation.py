@@ -2,31 +2,38 @@
 Agent Evaluation API endpoints
 Provides functionality to generate execution traces for evaluation
 """
-from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
-from fastapi.responses import StreamingResponse, RedirectResponse, FileResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse, RedirectResponse, FileResponse, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, Literal, List
 from datetime import datetime
 from pathlib import Path
+from stat import S_ISREG
+import asyncio
+import functools
+import hashlib
+import os
 import uuid
 import json
 import re
 
+import orjson
+
 from app.api.deps import get_db
 from app.services.trace_generator import TraceGenerator
 from app.services.cli.adapters.claude_agent_evaluation import ClaudeAgentEvaluation
 from app.core.terminal_ui import ui
 from app.core.config import PROJECT_ROOT, settings
+from app.core.responses import ORJSONResponse
 from app.models.messages import Message
 from app.models.projects import Project
+from app.services.evaluation_store import evaluation_store
+from app.services.evaluation_queue import evaluation_queue
 
 router = APIRouter(prefix="/api/eval", tags=["evaluation"])
 
-# Store evaluation results in memory
-evaluation_results: Dict[str, Dict[str, Any]] = {}
-
 
 class TraceGenerationRequest(BaseModel):
     """Request model for trace generation"""
@@ -75,6 +82,13 @@ class EvaluationResult(BaseModel):
     completed_at: Optional[str] = None
 
 
+def _has_messages(db: Session, project_id: str) -> bool:
+    """Check whether a project has any message (stops at the first index hit instead of counting)"""
+    return db.query(Message.id).filter(
+        Message.project_id == project_id
+    ).limit(1).scalar() is not None
+
+
 @router.post("/generate", response_model=TraceGenerationResponse)
 async def generate_trace(
     request: TraceGenerationRequest,
@@ -112,11 +126,7 @@ async def generate_trace(
         ui.info(f"Generating trace for project: {request.project_id}", "Trace Generation")
 
         # Check if project has messages
-        message_count = db.query(func.count(Message.id)).filter(
-            Message.project_id == request.project_id
-        ).scalar()
-
-        if message_count == 0:
+        if not _has_messages(db, request.project_id):
             raise HTTPException(
                 status_code=404,
                 detail=f"No messages found for project {request.project_id}"
@@ -128,7 +138,6 @@ async def generate_trace(
         traces_dir = project_dir
 
         ui.info(f"Output directory: {traces_dir}", "Trace Generation")
-        ui.info(f"Message count: {message_count}", "Trace Generation")
 
         # Generate traces using SQLAlchemy session
         generator = TraceGenerator(db)
@@ -137,6 +146,9 @@ async def generate_trace(
             output_dir=str(traces_dir),
             format=request.format
         )
+        # Messages are cached by the generator, so counting them needs no extra query
+        message_count = len(generator.get_project_messages(request.project_id))
+        ui.info(f"Message count: {message_count}", "Trace Generation")
 
         metadata = {
             'project_id': request.project_id,
@@ -169,6 +181,25 @@ async def generate_trace(
         )
 
 
+def _get_trace_status(project_ids: List[str]) -> Dict[str, tuple[bool, bool]]:
+    """Return (has_trace, has_evaluation) for each project (blocking filesystem checks)"""
+    status = {}
+    for project_id in project_ids:
+        trace_dir = f"{settings.projects_root}/{project_id}/data/traces"
+        # List the traces directory once instead of one exists() per file
+        try:
+            with os.scandir(trace_dir) as it:
+                names = {entry.name for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            names = set()
+        # Check if trace files exist
+        has_trace = "trace.md" in names or "trace.json" in names
+        # Check if evaluation report exists
+        has_evaluation = "trace_evaluation.md" in names
+        status[project_id] = (has_trace, has_evaluation)
+    return status
+
+
 @router.get("/projects")
 async def list_projects(
     page: int = Query(1, ge=1, description="Page number"),
@@ -189,64 +220,77 @@ async def list_projects(
         GET /api/eval/projects?page=1&page_size=10
     """
     try:
-        # Get total count of distinct projects
-        total_count = db.query(func.count(func.distinct(Message.project_id))).filter(
-            Message.project_id.isnot(None)
-        ).scalar()
-
-        # Calculate pagination
         offset = (page - 1) * page_size
-        total_pages = (total_count + page_size - 1) // page_size
 
-        # Get paginated project statistics using SQLAlchemy with LEFT JOIN on projects table
-        project_stats = db.query(
-            Message.project_id,
+        # Aggregate and paginate messages per project first (served by the
+        # (project_id, created_at) index), then LEFT JOIN only that page to projects.
+        # COUNT(*) OVER () is evaluated after GROUP BY and before LIMIT, so every row
+        # carries the total number of projects and no separate COUNT query is needed
+        page_stats = db.query(
+            Message.project_id.label('project_id'),
             func.count(Message.id).label('message_count'),
             func.min(Message.created_at).label('first_message'),
             func.max(Message.created_at).label('last_message'),
-            Project.name.label('project_name'),
-            Project.created_at.label('project_created_at')
-        ).outerjoin(
-            Project, Message.project_id == Project.id
+            func.count().over().label('total_count')
         ).filter(
             Message.project_id.isnot(None)
         ).group_by(
-            Message.project_id,
-            Project.name,
-            Project.created_at
+            Message.project_id
         ).order_by(
             func.max(Message.created_at).desc()
-        ).offset(offset).limit(page_size).all()
+        ).offset(offset).limit(page_size).subquery()
+
+        project_stats = db.query(
+            page_stats.c.project_id,
+            page_stats.c.message_count,
+            page_stats.c.first_message,
+            page_stats.c.last_message,
+            page_stats.c.total_count,
+            Project.name.label('project_name'),
+            Project.created_at.label('project_created_at')
+        ).outerjoin(
+            Project, page_stats.c.project_id == Project.id
+        ).order_by(
+            page_stats.c.last_message.desc()
+        ).all()
+
+        if project_stats:
+            total_count = project_stats[0].total_count
+        elif page == 1:
+            total_count = 0
+        else:
+            # Page past the end has no rows to carry the total; count separately
+            total_count = db.query(func.count(func.distinct(Message.project_id))).filter(
+                Message.project_id.isnot(None)
+            ).scalar()
+        total_pages = (total_count + page_size - 1) // page_size
+
+        # Check trace/evaluation files for the whole page in a worker thread
+        trace_status = await asyncio.to_thread(
+            _get_trace_status, [stat.project_id for stat in project_stats]
+        )
 
         projects = []
         for stat in project_stats:
             project_id = stat.project_id
             message_count = stat.message_count
-            # Add 'Z' suffix to indicate UTC timezone for proper client-side conversion
-            first_message = stat.first_message.isoformat() + 'Z' if stat.first_message else None
-            last_message = stat.last_message.isoformat() + 'Z' if stat.last_message else None
             project_name = stat.project_name if stat.project_name else project_id  # Fallback to ID if name is None
-            project_created_at = stat.project_created_at.isoformat() + 'Z' if stat.project_created_at else None
-
-            # Check if trace files exist
-            trace_dir = Path(settings.projects_root) / project_id / "data" / "traces"
-            has_trace = (trace_dir / "trace.md").exists() or (trace_dir / "trace.json").exists()
-
-            # Check if evaluation report exists
-            has_evaluation = (trace_dir / "trace_evaluation.md").exists()
+            has_trace, has_evaluation = trace_status[project_id]
 
             projects.append({
                 "project_id": project_id,
                 "project_name": project_name,
-                "project_created_at": project_created_at,
+                # Naive UTC datetimes are rendered with a 'Z' suffix by ORJSONResponse
+                "project_created_at": stat.project_created_at,
                 "message_count": message_count,
-                "first_message": first_message,
-                "last_message": last_message,
+                "first_message": stat.first_message,
+                "last_message": stat.last_message,
                 "has_trace": has_trace,
                 "has_evaluation": has_evaluation
             })
 
-        return {
+        # Return the response directly so datetimes skip jsonable_encoder and are encoded by orjson
+        return ORJSONResponse({
             "projects": projects,
             "pagination": {
                 "page": page,
@@ -256,7 +300,7 @@ async def list_projects(
                 "has_prev": page > 1,
                 "has_next": page < total_pages
             }
-        }
+        })
 
     except Exception as e:
         import traceback
@@ -269,8 +313,39 @@ async def list_projects(
         )
 
 
+# evaluation.html only changes on deploy, so it is stat'ed once per process
+_EVALUATION_HTML = PROJECT_ROOT / "static" / "evaluation.html"
+_dashboard_stat: Optional[os.stat_result] = None
+
+
+async def _get_dashboard_stat() -> os.stat_result:
+    """Return the cached stat of evaluation.html, raising 404/400 if it is unusable"""
+    global _dashboard_stat
+    if _dashboard_stat is not None:
+        return _dashboard_stat
+
+    # Stat in a worker thread so the event loop is not blocked on disk I/O
+    try:
+        stat_result = await asyncio.to_thread(_EVALUATION_HTML.stat)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Evaluation dashboard not found: {_EVALUATION_HTML}"
+        )
+
+    if not S_ISREG(stat_result.st_mode):
+        raise HTTPException(
+            status_code=400,
+            detail="Evaluation dashboard path is not a file"
+        )
+
+    _dashboard_stat = stat_result
+    return stat_result
+
+
 @router.get("/dashboard")
 async def get_dashboard(
+    request: Request,
     project_id: Optional[str] = Query(None, description="Project ID to generate traces for")
 ):
     """
@@ -290,34 +365,31 @@ async def get_dashboard(
         GET /api/eval/dashboard?project_id=project-123
     """
     # Serve evaluation.html directly from PROJECT_ROOT/static/
-    # This approach is similar to serve_static_file and doesn't rely on /static/ being accessible
-    evaluation_html = PROJECT_ROOT / "static" / "evaluation.html"
+    # This approach doesn't rely on /static/ being accessible
+    stat_result = await _get_dashboard_stat()
 
-    if not evaluation_html.exists():
-        raise HTTPException(
-            status_code=404,
-            detail=f"Evaluation dashboard not found: {evaluation_html}"
-        )
-
-    if not evaluation_html.is_file():
-        raise HTTPException(
-            status_code=400,
-            detail="Evaluation dashboard path is not a file"
-        )
+    # Short-circuit conditional requests; no-cache makes browsers revalidate after deploys
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
 
     # Return the HTML file directly
     # The project_id query parameter is preserved in the URL and will be read by JavaScript
     return FileResponse(
-        path=evaluation_html,
+        path=_EVALUATION_HTML,
         media_type="text/html",
         filename="evaluation.html",
-        content_disposition_type="inline"
+        content_disposition_type="inline",
+        stat_result=stat_result,
+        headers=headers
     )
 
 
 @router.get("/{project_id}")
 async def get_project_trace(
     project_id: str,
+    request: Request,
     format: Literal['markdown', 'json'] = Query('markdown', description="Trace format"),
     db: Session = Depends(get_db)
 ):
@@ -341,34 +413,43 @@ async def get_project_trace(
     try:
         ui.info(f"Getting trace for project: {project_id}", "Get Trace")
 
-        # Check if project has messages
-        message_count = db.query(func.count(Message.id)).filter(
+        # Check if project has messages; the latest timestamp also versions the trace
+        last_message_at = db.query(func.max(Message.created_at)).filter(
             Message.project_id == project_id
         ).scalar()
 
-        if message_count == 0:
+        if last_message_at is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No messages found for project {project_id}"
             )
 
-        ui.info(f"Generating trace for project: {project_id} ({message_count} messages)", "Get Trace")
-
         # Create generator with SQLAlchemy session
         generator = TraceGenerator(db)
 
         if format == 'markdown':
+            # The trace only changes when new messages arrive, so skip regenerating
+            # it when the client already has the current version
+            etag = '"' + hashlib.blake2b(
+                f"{project_id}:{last_message_at.isoformat()}".encode(), digest_size=8
+            ).hexdigest() + '"'
+            headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers=headers)
+
             content = generator.generate_markdown(project_id)
+            headers["Content-Disposition"] = f"inline; filename=trace_{project_id}.md"
             return StreamingResponse(
                 iter([content]),
                 media_type="text/markdown",
-                headers={
-                    "Content-Disposition": f"inline; filename=trace_{project_id}.md"
-                }
+                headers=headers
             )
         else:  # json
-            content = generator.generate_json(project_id, include_full_output=True)
-            return content
+            # Stream timeline entries instead of materializing the whole document
+            return StreamingResponse(
+                generator.generate_json_stream(project_id, include_full_output=True),
+                media_type="application/json"
+            )
 
     except HTTPException:
         raise
@@ -400,15 +481,18 @@ async def run_evaluation_task(
             ui.info(f"Reference answer provided: {len(reference_answer)} chars", "Evaluation Task")
 
         # Update status to running
-        evaluation_results[evaluation_id]["status"] = "running"
-        evaluation_results[evaluation_id]["progress"] = "Initializing evaluation agent..."
+        await evaluation_store.update(
+            evaluation_id,
+            status="running",
+            progress="Initializing evaluation agent...",
+        )
 
         # Create evaluator
         evaluator = ClaudeAgentEvaluation(project_id="evaluation", model=model)
         ui.success("Evaluator created", "Evaluation Task")
 
         # Collect all messages
-        evaluation_results[evaluation_id]["progress"] = "Running evaluation..."
+        await evaluation_store.update(evaluation_id, progress="Running evaluation...")
         messages = []
         message_count = 0
 
@@ -423,12 +507,16 @@ async def run_evaluation_task(
             reference_answer=reference_answer,
         ):
             message_count += 1
-            ui.debug(f"Received message #{message_count}: type={message.message_type}, role={message.role}", "Evaluation Task")
+            if ui.debug_enabled:
+                ui.debug(f"Received message #{message_count}: type={message.message_type}, role={message.role}", "Evaluation Task")
 
             # Collect chat messages for the report
             if message.message_type == "chat":
                 messages.append(message.content)
-                evaluation_results[evaluation_id]["progress"] = f"Generating report... ({len(messages)} messages received)"
+                await evaluation_store.update(
+                    evaluation_id,
+                    progress=f"Generating report... ({len(messages)} messages received)",
+                )
                 ui.info(f"Chat message #{len(messages)}: {message.content[:100]}...", "Evaluation Task")
 
             # Handle error messages
@@ -442,9 +530,12 @@ async def run_evaluation_task(
         # Check if we got any messages
         if len(messages) == 0:
             ui.warning("No chat messages received from evaluation!", "Evaluation Task")
-            evaluation_results[evaluation_id]["status"] = "failed"
-            evaluation_results[evaluation_id]["error"] = "No evaluation report generated - agent did not produce any output"
-            evaluation_results[evaluation_id]["completed_at"] = datetime.utcnow().isoformat()
+            await evaluation_store.update(
+                evaluation_id,
+                status="failed",
+                error="No evaluation report generated - agent did not produce any output",
+                completed_at=datetime.utcnow().isoformat(),
+            )
             return
 
         # Combine all messages into final report
@@ -456,16 +547,19 @@ async def run_evaluation_task(
         ui.info(f"Parsed scores: {scores}", "Evaluation Task")
 
         # Update result
-        evaluation_results[evaluation_id]["status"] = "completed"
-        evaluation_results[evaluation_id]["report"] = report
-        evaluation_results[evaluation_id]["overall"] = scores.get("overall")
-        evaluation_results[evaluation_id]["correctness"] = scores.get("correctness")
-        evaluation_results[evaluation_id]["efficiency"] = scores.get("efficiency")
-        evaluation_results[evaluation_id]["robustness"] = scores.get("robustness")
-        evaluation_results[evaluation_id]["summary"] = scores.get("summary")
-        evaluation_results[evaluation_id]["details"] = scores.get("details")
-        evaluation_results[evaluation_id]["completed_at"] = datetime.utcnow().isoformat()
-        evaluation_results[evaluation_id]["progress"] = "Evaluation completed"
+        await evaluation_store.update(
+            evaluation_id,
+            status="completed",
+            report=report,
+            overall=scores.get("overall"),
+            correctness=scores.get("correctness"),
+            efficiency=scores.get("efficiency"),
+            robustness=scores.get("robustness"),
+            summary=scores.get("summary"),
+            details=scores.get("details"),
+            completed_at=datetime.utcnow().isoformat(),
+            progress="Evaluation completed",
+        )
 
         ui.success(f"Evaluation {evaluation_id} completed successfully", "Evaluation Task")
 
@@ -474,9 +568,23 @@ async def run_evaluation_task(
         error_details = traceback.format_exc()
         ui.error(f"Evaluation {evaluation_id} failed: {e}", "Evaluation Task")
         ui.error(f"Traceback: {error_details}", "Evaluation Task")
-        evaluation_results[evaluation_id]["status"] = "failed"
-        evaluation_results[evaluation_id]["error"] = f"{str(e)}\n\nTraceback:\n{error_details}"
-        evaluation_results[evaluation_id]["completed_at"] = datetime.utcnow().isoformat()
+        await evaluation_store.update(
+            evaluation_id,
+            status="failed",
+            error=f"{str(e)}\n\nTraceback:\n{error_details}",
+            completed_at=datetime.utcnow().isoformat(),
+        )
+
+
+# Score labels in the evaluation report -> result keys
+_SCORE_KEYS = {
+    "综合得分": "overall",
+    "正确性": "correctness",
+    "效率": "efficiency",
+    "鲁棒性": "robustness",
+}
+_SCORE_PATTERN = re.compile(r'(综合得分|正确性|效率|鲁棒性)[：:]\s*(\d+)')
+_SUMMARY_PATTERN = re.compile(r'##\s*总结.*?\n(.*?)(?=\n##|\Z)', re.DOTALL)
 
 
 def parse_evaluation_scores(report: str) -> Dict[str, Any]:
@@ -491,30 +599,20 @@ def parse_evaluation_scores(report: str) -> Dict[str, Any]:
     }
 
     try:
-        # Try to find score patterns in the report
-        # Look for patterns like "综合得分: 85" or "Correctness: 90/100"
-        overall_match = re.search(r'综合得分[：:]\s*(\d+)', report)
-        if overall_match:
-            scores["overall"] = int(overall_match.group(1))
-
-        correctness_match = re.search(r'正确性[：:]\s*(\d+)', report)
-        if correctness_match:
-            scores["correctness"] = int(correctness_match.group(1))
-
-        efficiency_match = re.search(r'效率[：:]\s*(\d+)', report)
-        if efficiency_match:
-            scores["efficiency"] = int(efficiency_match.group(1))
-
-        robustness_match = re.search(r'鲁棒性[：:]\s*(\d+)', report)
-        if robustness_match:
-            scores["robustness"] = int(robustness_match.group(1))
+        # Find score patterns like "综合得分: 85" in a single pass;
+        # the first occurrence of each label wins
+        for match in _SCORE_PATTERN.finditer(report):
+            key = _SCORE_KEYS[match.group(1)]
+            if scores[key] is None:
+                scores[key] = int(match.group(2))
 
         # Extract summary section
-        summary_match = re.search(r'##\s*总结.*?\n(.*?)(?=\n##|\Z)', report, re.DOTALL)
+        summary_match = _SUMMARY_PATTERN.search(report)
         if summary_match:
             scores["summary"] = summary_match.group(1).strip()
 
-        ui.debug(f"Parsed scores: {scores}", "Parse Scores")
+        if ui.debug_enabled:
+            ui.debug(f"Parsed scores: {scores}", "Parse Scores")
 
     except Exception as e:
         ui.warning(f"Failed to parse some scores: {e}", "Parse Scores")
@@ -525,13 +623,13 @@ def parse_evaluation_scores(report: str) -> Dict[str, Any]:
 @router.post("/evaluate", response_model=EvaluationResponse)
 async def evaluate_project(
     request: EvaluationRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     Start evaluation of a project's trace file.
 
-    This endpoint initiates the evaluation process as a background task and returns immediately.
+    This endpoint queues the evaluation on the bounded evaluation worker pool and returns
+    immediately. Returns 429 when too many evaluations are already queued.
     Use GET /api/eval/evaluate/{evaluation_id} to check the status and get results.
 
     Args:
@@ -563,11 +661,18 @@ async def evaluate_project(
                 detail=f"Trace file not found for project {request.project_id}. Please generate trace first."
             )
 
+        # Apply backpressure before creating any state
+        if evaluation_queue.pending >= evaluation_queue.max_queue:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many evaluations queued, please retry later"
+            )
+
         # Generate evaluation ID
         evaluation_id = str(uuid.uuid4())
 
         # Initialize result storage
-        evaluation_results[evaluation_id] = {
+        await evaluation_store.create(evaluation_id, {
             "evaluation_id": evaluation_id,
             "status": "pending",
             "project_id": request.project_id,
@@ -575,19 +680,30 @@ async def evaluate_project(
             "model": request.model,
             "started_at": datetime.utcnow().isoformat(),
             "progress": "Queued for evaluation",
-        }
-
-        ui.success(f"Evaluation {evaluation_id} queued for project: {request.project_id}", "Evaluation API")
+        })
 
-        # Start background task
-        background_tasks.add_task(
+        # Queue on the bounded worker pool
+        queued = evaluation_queue.submit(functools.partial(
             run_evaluation_task,
             evaluation_id,
             request.project_id,
             str(trace_file),
             request.model or "claude-sonnet-4-5-20250929",
             request.reference_answer
-        )
+        ))
+        if not queued:
+            await evaluation_store.update(
+                evaluation_id,
+                status="failed",
+                error="Evaluation queue is full",
+                completed_at=datetime.utcnow().isoformat(),
+            )
+            raise HTTPException(
+                status_code=429,
+                detail="Too many evaluations queued, please retry later"
+            )
+
+        ui.success(f"Evaluation {evaluation_id} queued for project: {request.project_id}", "Evaluation API")
 
         return EvaluationResponse(
             status="started",
@@ -605,8 +721,8 @@ async def evaluate_project(
         )
 
 
-@router.get("/evaluate/{evaluation_id}", response_model=EvaluationResult)
-async def get_evaluation_result(evaluation_id: str, db: Session = Depends(get_db)):
+@router.get("/evaluate/{evaluation_id}", response_model=EvaluationResult, response_class=ORJSONResponse)
+async def get_evaluation_result(evaluation_id: str):
     """
     Get the result of an evaluation task.
 
@@ -619,12 +735,12 @@ async def get_evaluation_result(evaluation_id: str, db: Session = Depends(get_db
     Example:
         GET /api/eval/evaluate/550e8400-e29b-41d4-a716-446655440000
     """
-    if evaluation_id not in evaluation_results:
+    result = await evaluation_store.get(evaluation_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Evaluation not found")
 
-    result = evaluation_results[evaluation_id]
-
-    return EvaluationResult(
+    # State is written only by this module, so skip re-validation
+    return EvaluationResult.model_construct(
         evaluation_id=result["evaluation_id"],
         status=result["status"],
         progress=result.get("progress"),
@@ -641,9 +757,42 @@ async def get_evaluation_result(evaluation_id: str, db: Session = Depends(get_db
     )
 
 
-@router.get("/{project_id}/evaluation-report")
+@router.get("/evaluate/{evaluation_id}/stream")
+async def stream_evaluation_result(evaluation_id: str):
+    """
+    Stream progress of an evaluation task as Server-Sent Events.
+
+    Sends the current state immediately and again on every update, and closes the
+    stream once the evaluation is completed or failed. Idle periods send a comment
+    line so proxies keep the connection open.
+
+    Args:
+        evaluation_id: The evaluation ID returned from POST /api/eval/evaluate
+
+    Example:
+        GET /api/eval/evaluate/550e8400-e29b-41d4-a716-446655440000/stream
+    """
+    if await evaluation_store.get(evaluation_id) is None:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+
+    async def event_stream():
+        async for state in evaluation_store.watch(evaluation_id):
+            if state is None:
+                yield b": keep-alive\n\n"
+            else:
+                yield b"data: " + orjson.dumps(state) + b"\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{project_id}/evaluation-report", response_class=ORJSONResponse)
 async def get_evaluation_report(
     project_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -653,7 +802,8 @@ async def get_evaluation_report(
         project_id: The project ID
 
     Returns:
-        The evaluation report in Markdown format
+        The evaluation report in Markdown format. Clients that send
+        ``Accept: text/markdown`` receive the raw file instead of JSON.
 
     Examples:
         GET /api/eval/project-123/evaluation-report
@@ -665,23 +815,33 @@ async def get_evaluation_report(
         trace_dir = Path(settings.projects_root) / project_id / "data" / "traces"
         report_file = trace_dir / "trace_evaluation.md"
 
-        if not report_file.exists():
-            raise HTTPException(
-                status_code=404,
-                detail=f"Evaluation report not found for project {project_id}"
-            )
-
-        ui.info(f"Reading report from: {report_file}", "Get Report")
-
-        # Read the report
-        with open(report_file, 'r', encoding='utf-8') as f:
-            report_content = f.read()
+        # Serve the raw file (sendfile-capable) when the client asks for markdown
+        if "text/markdown" in request.headers.get("accept", ""):
+            try:
+                stat_result = await asyncio.to_thread(report_file.stat)
+            except FileNotFoundError:
+                stat_result = None
+            if stat_result is not None:
+                return FileResponse(report_file, media_type="text/markdown", stat_result=stat_result)
+        else:
+            ui.info(f"Reading report from: {report_file}", "Get Report")
+
+            # Read the report in a worker thread so the event loop is not blocked
+            try:
+                report_content = await asyncio.to_thread(report_file.read_text, encoding='utf-8')
+            except FileNotFoundError:
+                report_content = None
+            if report_content is not None:
+                return {
+                    "project_id": project_id,
+                    "report": report_content,
+                    "file_path": str(report_file)
+                }
 
-        return {
-            "project_id": project_id,
-            "report": report_content,
-            "file_path": str(report_file)
-        }
+        raise HTTPException(
+            status_code=404,
+            detail=f"Evaluation report not found for project {project_id}"
+        )
 
     except HTTPException:
         raise
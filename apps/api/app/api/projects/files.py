@@ -4,9 +4,14 @@ Handles file listing and search for @ mention autocomplete
 """
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
+import asyncio
+import heapq
 import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 
 from app.api.deps import get_db
@@ -30,6 +35,35 @@ class FileSearchResponse(BaseModel):
     total: int
 
 
+# 忽略的目录
+IGNORED_DIRS = frozenset({
+    '.git', '.next', 'node_modules', '__pycache__',
+    '.venv', 'venv', 'dist', 'build', '.cache',
+    '.DS_Store', '.vscode', '.idea', 'coverage',
+    '.pytest_cache', '.mypy_cache', 'out', 'target'
+})
+
+# 忽略的文件扩展名（tuple 形式可直接传给 str.endswith）
+IGNORED_EXTENSIONS = (
+    '.pyc', '.pyo', '.swp', '.swo', '.log',
+    '.lock', '.tmp', '.temp', '.bak', '.map'
+)
+
+# 文件索引条目：(小写相对路径, 文件条目)，小写路径在建索引时预先计算
+IndexEntry = Tuple[str, FileItem]
+
+# 文件索引缓存：project_path -> (根目录 mtime, 过期时间, 文件索引条目列表)，按 LRU 淘汰
+# 根目录 mtime 变化时立即失效；子目录内的增删改不会改变根目录 mtime，
+# 最多在 TTL 内返回旧索引
+_FILE_INDEX_TTL = 10.0
+_FILE_INDEX_MAX_PROJECTS = 32
+_file_index_cache: "OrderedDict[str, Tuple[float, float, List[IndexEntry]]]" = OrderedDict()
+# 每个项目的重建锁，与缓存条目一起清理
+_file_index_locks: Dict[str, threading.Lock] = {}
+# 保护上面两个字典
+_file_index_guard = threading.Lock()
+
+
 @router.get("/{project_id}/files/search", response_model=FileSearchResponse)
 async def search_project_files(
     project_id: str,
@@ -56,10 +90,10 @@ async def search_project_files(
     # 获取项目路径
     project_path = os.path.join(settings.projects_root, project_id)
 
-    # 搜索文件
+    # 搜索文件（索引重建会遍历整个目录树，放到线程中执行，避免阻塞事件循环）
     try:
-        files = search_files(project_path, q, limit)
-        return FileSearchResponse(
+        files = await asyncio.to_thread(search_files, project_path, q, limit)
+        return FileSearchResponse.model_construct(
             files=files,
             total=len(files)
         )
@@ -80,78 +114,136 @@ def search_files(project_path: str, query: str, limit: int) -> List[FileItem]:
     返回:
         List[FileItem]: 匹配的文件列表
     """
-    # 忽略的目录
-    IGNORED_DIRS = {
-        '.git', '.next', 'node_modules', '__pycache__',
-        '.venv', 'venv', 'dist', 'build', '.cache',
-        '.DS_Store', '.vscode', '.idea', 'coverage',
-        '.pytest_cache', '.mypy_cache', 'out', 'target'
-    }
-
-    # 忽略的文件扩展名
-    IGNORED_EXTENSIONS = {
-        '.pyc', '.pyo', '.swp', '.swo', '.log',
-        '.lock', '.tmp', '.temp', '.bak', '.map'
-    }
-
-    results = []
     query_lower = query.lower()
 
-    # 遍历项目目录
-    for root, dirs, files in os.walk(project_path):
-        # 过滤忽略的目录（就地修改 dirs 列表）
-        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS and not d.startswith('.')]
-
-        # 计算相对路径
-        rel_root = os.path.relpath(root, project_path)
-        if rel_root == '.':
-            rel_root = ''
-
-        # 搜索目录
-        for dir_name in dirs:
-            rel_dir_path = os.path.join(rel_root, dir_name) if rel_root else dir_name
-
-            # 模糊匹配
-            if not query or query_lower in rel_dir_path.lower() or query_lower in dir_name.lower():
-                results.append(FileItem(
-                    path=rel_dir_path,
-                    type='dir',
-                    name=dir_name
-                ))
-
-        # 搜索文件
-        for file_name in files:
-            # 跳过忽略的扩展名
-            if any(file_name.endswith(ext) for ext in IGNORED_EXTENSIONS):
-                continue
-
-            rel_file_path = os.path.join(rel_root, file_name) if rel_root else file_name
-
-            # 模糊匹配（匹配完整路径或文件名）
-            if not query or query_lower in rel_file_path.lower() or query_lower in file_name.lower():
-                file_full_path = os.path.join(root, file_name)
-                try:
-                    file_size = os.path.getsize(file_full_path)
-                except:
-                    file_size = None
-
-                results.append(FileItem(
-                    path=rel_file_path,
-                    type='file',
-                    size=file_size,
-                    name=file_name
-                ))
-
-        # 如果结果已经足够，提前退出
-        if len(results) >= limit * 2:  # 收集更多结果以便后续排序
-            break
+    # 模糊匹配完整路径（文件名是路径的最后一段，匹配文件名必然匹配路径）
+    matches = (
+        entry for entry in _get_file_index(project_path)
+        if query_lower in entry[0]
+    )
 
     # 排序：目录优先，然后按路径长度（更短的更相关）
-    results.sort(key=lambda x: (
-        0 if x.type == 'dir' else 1,  # 目录优先
-        len(x.path),  # 路径长度
-        x.path.lower()  # 字母顺序
+    # 只保留前 limit 个，用有界堆代替全量排序
+    top = heapq.nsmallest(limit, matches, key=lambda entry: (
+        0 if entry[1].type == 'dir' else 1,  # 目录优先
+        len(entry[0]),  # 路径长度
+        entry[0]  # 字母顺序
     ))
+    return [item for _, item in top]
+
+
+def _get_file_index(project_path: str) -> List[IndexEntry]:
+    """
+    获取项目文件索引（带缓存）
+
+    参数:
+        project_path: 项目根目录
 
-    # 限制返回数量
-    return results[:limit]
+    返回:
+        List[IndexEntry]: 项目中所有未被忽略的目录和文件
+    """
+    try:
+        root_mtime = os.stat(project_path).st_mtime
+    except FileNotFoundError:
+        # 项目已删除，释放它的索引和锁
+        with _file_index_guard:
+            _file_index_cache.pop(project_path, None)
+            _file_index_locks.pop(project_path, None)
+        return []
+
+    cached = _get_cached_index(project_path, root_mtime)
+    if cached is not None:
+        return cached
+
+    # 同一项目同时只重建一次，避免并发请求重复遍历
+    with _file_index_guard:
+        lock = _file_index_locks.setdefault(project_path, threading.Lock())
+    with lock:
+        cached = _get_cached_index(project_path, root_mtime)
+        if cached is not None:
+            return cached
+
+        entries = _build_file_index(project_path)
+        _store_index(project_path, root_mtime, entries)
+        return entries
+
+
+def _get_cached_index(project_path: str, root_mtime: float) -> Optional[List[IndexEntry]]:
+    """读取仍然有效的缓存索引，未命中返回 None"""
+    with _file_index_guard:
+        cached = _file_index_cache.get(project_path)
+        if cached and cached[0] == root_mtime and cached[1] > time.monotonic():
+            _file_index_cache.move_to_end(project_path)
+            return cached[2]
+    return None
+
+
+def _store_index(project_path: str, root_mtime: float, entries: List[IndexEntry]) -> None:
+    """写入缓存，超出项目数上限时淘汰最久未用的项目（连同空闲的锁）"""
+    with _file_index_guard:
+        _file_index_cache[project_path] = (root_mtime, time.monotonic() + _FILE_INDEX_TTL, entries)
+        _file_index_cache.move_to_end(project_path)
+        while len(_file_index_cache) > _FILE_INDEX_MAX_PROJECTS:
+            evicted, _ = _file_index_cache.popitem(last=False)
+            lock = _file_index_locks.get(evicted)
+            if lock is not None and not lock.locked():
+                del _file_index_locks[evicted]
+
+
+def _build_file_index(project_path: str) -> List[IndexEntry]:
+    """
+    遍历项目目录，收集所有未被忽略的目录和文件
+
+    参数:
+        project_path: 项目根目录
+
+    返回:
+        List[IndexEntry]: 文件索引条目列表
+    """
+    entries = []
+    # 项目根目录前缀长度，用于从 entry.path 截取相对路径
+    prefix_len = len(os.path.join(project_path, ''))
+
+    # 使用显式栈 + os.scandir 深度优先遍历，复用 DirEntry 缓存的类型和 stat 信息
+    # 条目来自本地文件系统，使用 model_construct 跳过校验
+    stack = [project_path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    name = entry.name
+
+                    if entry.is_dir(follow_symlinks=False):
+                        # 跳过忽略的目录和隐藏目录
+                        if name in IGNORED_DIRS or name.startswith('.'):
+                            continue
+                        rel_path = entry.path[prefix_len:]
+                        entries.append((rel_path.lower(), FileItem.model_construct(
+                            path=rel_path,
+                            type='dir',
+                            name=name
+                        )))
+                        stack.append(entry.path)
+                        continue
+
+                    # 跳过忽略的扩展名
+                    if name.endswith(IGNORED_EXTENSIONS):
+                        continue
+
+                    try:
+                        file_size = entry.stat().st_size
+                    except OSError:
+                        file_size = None
+
+                    rel_path = entry.path[prefix_len:]
+                    entries.append((rel_path.lower(), FileItem.model_construct(
+                        path=rel_path,
+                        type='file',
+                        size=file_size,
+                        name=name
+                    )))
+        except OSError:
+            # 目录不可读或已被删除
+            continue
+
+    return entries
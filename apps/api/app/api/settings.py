@@ -1,6 +1,7 @@
 import asyncio
+import time
 from typing import Dict, Any
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from pydantic import BaseModel
 from app.common.types import AgentType
 
@@ -13,8 +14,26 @@ class CLIStatusResponse(BaseModel):
     error: str | None = None
 
 
-async def check_cli_installation(cli_id: str, command: list) -> CLIStatusResponse:
-    """단일 CLI의 설치 상태를 확인합니다."""
+# CLI 探测结果缓存：cli_id -> (探测时间, 结果)；安装状态变化很慢，避免每次请求都 fork 子进程
+_CLI_CACHE_TTL = 300.0
+_cli_cache: Dict[str, tuple[float, CLIStatusResponse]] = {}
+
+
+async def check_cli_installation(cli_id: str, command: list, force_reload: bool = False) -> CLIStatusResponse:
+    """단일 CLI의 설치 상태를 확인합니다. (성공 결과는 TTL 동안 캐시)"""
+    cached = _cli_cache.get(cli_id)
+    if not force_reload and cached and time.monotonic() - cached[0] < _CLI_CACHE_TTL:
+        return cached[1]
+
+    status = await _run_cli_probe(cli_id, command)
+    if status.installed:
+        _cli_cache[cli_id] = (time.monotonic(), status)
+    else:
+        _cli_cache.pop(cli_id, None)
+    return status
+
+
+async def _run_cli_probe(cli_id: str, command: list) -> CLIStatusResponse:
     try:
         # subprocess를 비동기로 실행
         process = await asyncio.create_subprocess_exec(
@@ -61,24 +80,43 @@ async def check_cli_installation(cli_id: str, command: list) -> CLIStatusRespons
         )
 
 
-@router.get("/cli-status")
-async def get_cli_status() -> Dict[str, Any]:
-    """ 校验客户端是否可用 """
-    results = {}
+# 各智能体依赖的外部 CLI 探测命令；None 表示智能体在进程内通过 SDK 运行，无需探测
+CLI_PROBES: Dict[AgentType, list | None] = {
+    AgentType.NEXT_JS: None,
+    AgentType.ANALYIS: None,
+    AgentType.FIN_ANALYSIS: None,
+}
+
+# 限制同时运行的探测子进程数量
+_CLI_PROBE_SEMAPHORE = asyncio.Semaphore(4)
 
-    cli_types = [AgentType.NEXT_JS,AgentType.ANALYIS,AgentType.FIN_ANALYSIS]
-    AgentType.__class__.__iter__
 
-    # CLI 확인
-    for cli_type in cli_types:
-        results[cli_type.value] = {
-            "installed": True,
-            "version": None,
-            "error": None,
+async def _probe_cli(cli_type: AgentType, command: list | None, force_reload: bool) -> CLIStatusResponse:
+    if command is None:
+        return CLIStatusResponse(cli_id=cli_type.value, installed=True)
+    async with _CLI_PROBE_SEMAPHORE:
+        return await check_cli_installation(cli_type.value, command, force_reload=force_reload)
+
+
+@router.get("/cli-status")
+async def get_cli_status(
+    refresh: bool = Query(False, description="忽略缓存，重新探测")
+) -> Dict[str, Any]:
+    """ 校验客户端是否可用 """
+    # 并发探测所有 CLI，总耗时取决于最慢的一个而不是全部之和
+    statuses = await asyncio.gather(
+        *(_probe_cli(cli_type, command, refresh) for cli_type, command in CLI_PROBES.items())
+    )
+
+    return {
+        status.cli_id: {
+            "installed": status.installed,
+            "version": status.version,
+            "error": status.error,
             "checking": False
         }
-
-    return results
+        for status in statuses
+    }
 
 
 # 默认使用数据分析智能体
@@ -97,6 +135,7 @@ class GlobalSettingsModel(BaseModel):
 @router.get("/global")
 async def get_global_settings() -> Dict[str, Any]:
     """글로벌 설정을 반환합니다."""
+    # GLOBAL_SETTINGS 只会被整体替换、不会原地修改，读取无需加锁
     return GLOBAL_SETTINGS
 
 
@@ -104,10 +143,12 @@ async def get_global_settings() -> Dict[str, Any]:
 async def update_global_settings(settings: GlobalSettingsModel) -> Dict[str, Any]:
     """글로벌 설정을 업데이트합니다."""
     global GLOBAL_SETTINGS
-    
-    GLOBAL_SETTINGS.update({
+
+    # 写时复制：构建新字典后整体替换引用，正在序列化旧字典的读请求不受影响
+    GLOBAL_SETTINGS = {
+        **GLOBAL_SETTINGS,
         "default_cli": settings.default_cli,
         "cli_settings": settings.cli_settings
-    })
-    
+    }
+
     return {"success": True, "settings": GLOBAL_SETTINGS}
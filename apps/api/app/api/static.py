@@ -3,63 +3,247 @@
 
 提供静态文件服务功能，支持浏览器访问静态页面和资源
 """
-
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-from pathlib import Path
 import mimetypes
 import os
+import stat
+import threading
+from collections import OrderedDict
 
-from app.core.config import settings
-
-router = APIRouter()
-
-
-def get_content_type(file_path: Path) -> str:
-    """
-    根据文件扩展名获取 Content-Type
-
-    Args:
-        file_path: 文件路径
+from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
 
-    Returns:
-        MIME 类型字符串
+from app.core.config import settings
+from app.core.responses import StaticFileResponse
+
+
+# 扩展名 -> MIME 类型，导入时构建一次，避免每次请求调用 mimetypes.guess_type
+mimetypes.init()
+_MEDIA_TYPES: dict[str, str] = {
+    **mimetypes.types_map,
+    ".html": "text/html",
+    ".css": "text/css",
+    ".js": "text/javascript",
+    ".mjs": "text/javascript",
+    ".json": "application/json",
+    ".map": "application/json",
+    ".svg": "image/svg+xml",
+    ".wasm": "application/wasm",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".webp": "image/webp",
+    ".md": "text/markdown",
+    ".csv": "text/csv",
+}
+
+
+def _get_media_type(path: str) -> str:
+    """根据扩展名获取 MIME 类型，未知扩展名回退到 mimetypes"""
+    ext = os.path.splitext(path)[1]
+    media_type = _MEDIA_TYPES.get(ext) or _MEDIA_TYPES.get(ext.lower())
+    if media_type is None:
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return media_type
+
+
+# 小文件内存缓存：full_path -> (st_mtime_ns, st_size, 文件内容)，按 LRU 淘汰
+# 命中时以 mtime/size 校验，文件被修改后自动失效
+_CACHE_MAX_FILE_SIZE = 256 * 1024
+_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_file_cache: "OrderedDict[str, tuple[int, int, bytes]]" = OrderedDict()
+_file_cache_bytes = 0
+_file_cache_lock = threading.Lock()
+
+
+def _get_cached_file(full_path: str, stat_result: os.stat_result) -> bytes | None:
+    """读取与当前 stat 一致的缓存内容，未命中返回 None"""
+    with _file_cache_lock:
+        cached = _file_cache.get(full_path)
+        if cached is None:
+            return None
+        if cached[0] != stat_result.st_mtime_ns or cached[1] != stat_result.st_size:
+            return None
+        _file_cache.move_to_end(full_path)
+        return cached[2]
+
+
+def _cache_file(full_path: str, stat_result: os.stat_result) -> None:
+    """读取文件并放入缓存（在响应发送后于线程池中执行）"""
+    global _file_cache_bytes
+    try:
+        with open(full_path, "rb") as f:
+            content = f.read(_CACHE_MAX_FILE_SIZE + 1)
+    except OSError:
+        return
+    # 文件在 stat 之后被修改，不缓存
+    if len(content) != stat_result.st_size:
+        return
+
+    with _file_cache_lock:
+        previous = _file_cache.pop(full_path, None)
+        if previous is not None:
+            _file_cache_bytes -= previous[1]
+        _file_cache[full_path] = (stat_result.st_mtime_ns, stat_result.st_size, content)
+        _file_cache_bytes += stat_result.st_size
+        while _file_cache_bytes > _CACHE_MAX_BYTES:
+            _, evicted = _file_cache.popitem(last=False)
+            _file_cache_bytes -= evicted[1]
+
+
+# 预压缩文件：按优先级排列的 (Content-Encoding, 文件后缀)
+_PRECOMPRESSED_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+# 预压缩文件探测缓存：full_path -> (原文件 st_mtime_ns, {encoding: (压缩文件路径, stat)})，按 LRU 淘汰
+# 原文件重新构建时 mtime 变化，缓存随之失效；已存在的压缩文件每次请求都重新 stat，
+# 单独重新生成或删除压缩文件时不会使用过期的 stat。只缓存存在的普通文件
+_VARIANT_CACHE_MAX_ENTRIES = 4096
+_variant_cache: "OrderedDict[str, tuple[int, dict[str, tuple[str, os.stat_result]]]]" = OrderedDict()
+_variant_cache_lock = threading.Lock()
+
+
+def _stat_variant(variant_path: str) -> os.stat_result | None:
+    try:
+        variant_stat = os.stat(variant_path)
+    except OSError:
+        return None
+    return variant_stat if stat.S_ISREG(variant_stat.st_mode) else None
+
+
+def _probe_precompressed_variants(full_path: str, stat_result: os.stat_result) -> None:
+    """探测并缓存 full_path 的预压缩文件（有文件系统调用，在线程池中执行）"""
+    with _variant_cache_lock:
+        cached = _variant_cache.get(full_path)
+
+    if cached is not None and cached[0] == stat_result.st_mtime_ns:
+        # 原文件未变：只重新 stat 已知存在的压缩文件
+        candidates = [(encoding, variant_path) for encoding, (variant_path, _) in cached[1].items()]
+    else:
+        candidates = [(encoding, full_path + suffix) for encoding, suffix in _PRECOMPRESSED_VARIANTS]
+
+    variants = {}
+    for encoding, variant_path in candidates:
+        variant_stat = _stat_variant(variant_path)
+        if variant_stat is not None:
+            variants[encoding] = (variant_path, variant_stat)
+
+    with _variant_cache_lock:
+        _variant_cache[full_path] = (stat_result.st_mtime_ns, variants)
+        _variant_cache.move_to_end(full_path)
+        while len(_variant_cache) > _VARIANT_CACHE_MAX_ENTRIES:
+            _variant_cache.popitem(last=False)
+
+
+def _get_precompressed_variants(
+    full_path: str, stat_result: os.stat_result
+) -> dict[str, tuple[str, os.stat_result]]:
+    """读取 lookup_path 刚探测过的结果，不做文件系统调用；没有结果时按无压缩文件处理"""
+    with _variant_cache_lock:
+        cached = _variant_cache.get(full_path)
+    if cached is not None and cached[0] == stat_result.st_mtime_ns:
+        return cached[1]
+    return {}
+
+
+def _parse_accept_encoding(header: str) -> set[str]:
+    """解析 Accept-Encoding，返回客户端接受的编码（忽略 q=0）"""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:].rstrip("0.") == "":
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class ProjectStaticFiles(StaticFiles):
     """
-    content_type, _ = mimetypes.guess_type(str(file_path))
-    return content_type or "application/octet-stream"
-
+    StaticFiles 子类
 
-@router.get("/{file_path:path}")
-async def serve_static_file(file_path: str):
+    - 存在 .br/.gz 预压缩文件且客户端接受时直接发送压缩文件
+    - 小文件从内存缓存返回，避免重复读盘
+    - 其他文件交给 FileResponse，服务器支持 ASGI pathsend 扩展时由服务器直接发送
+    - 根目录的 realpath 只解析一次，而不是每个请求都解析
     """
-    提供静态文件服务
 
-    Args:
-        file_path: 相对于静态资源目录的文件路径
-
-    Returns:
-        文件响应
-
-    Raises:
-        HTTPException: 文件不存在或访问错误时抛出
-    """
-    # 构建完整文件路径
-    full_path = Path(os.path.join(settings.projects_root,file_path))
-    
-
-    # 检查文件是否存在
-    if not full_path.exists():
-        raise HTTPException(status_code=404, detail=f"文件不存在: {file_path}")
-
-    # 检查是否为文件（不允许访问目录）
-    if not full_path.is_file():
-        raise HTTPException(status_code=400, detail="请求的路径不是文件")
-
-    # 返回文件
-    content_type = get_content_type(full_path)
-    return FileResponse(
-        path=full_path,
-        media_type=content_type,
-        filename=full_path.name,
-        content_disposition_type="inline"
-    )
+    def __init__(self, *, directory: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self._root = os.path.realpath(directory)
+
+    def lookup_path(self, path: str) -> tuple[str, os.stat_result | None]:
+        # Reject absolute paths so they cannot escape the served directory
+        if path.startswith(("/", "\\")):
+            return "", None
+        # 解析符号链接后仍须位于根目录内，防止通过 .. 或符号链接访问外部文件
+        full_path = os.path.realpath(os.path.join(self._root, path))
+        if os.path.commonpath([full_path, self._root]) != self._root:
+            return "", None
+        try:
+            stat_result = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return "", None
+        # Starlette 在线程池中调用 lookup_path，预压缩文件的 stat 也放在这里完成
+        if stat.S_ISREG(stat_result.st_mode):
+            _probe_precompressed_variants(full_path, stat_result)
+        return full_path, stat_result
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = os.fspath(full_path)
+        request_headers = Headers(scope=scope)
+        media_type = _get_media_type(full_path)
+        # 与原 serve_static_file 一致：inline 展示，文件名取原文件（而非 .br/.gz）
+        filename = os.path.basename(full_path)
+        headers = None
+
+        variants = _get_precompressed_variants(full_path, stat_result)
+        if variants:
+            headers = {"Vary": "Accept-Encoding"}
+            accepted = _parse_accept_encoding(request_headers.get("accept-encoding", ""))
+            for encoding, _ in _PRECOMPRESSED_VARIANTS:
+                if encoding in accepted and encoding in variants:
+                    # 发送压缩文件，Content-Type 仍取原文件；ETag 由压缩文件的 stat 生成
+                    full_path, stat_result = variants[encoding]
+                    headers["Content-Encoding"] = encoding
+                    break
+
+        response = StaticFileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            filename=filename,
+            stat_result=stat_result,
+            content_disposition_type="inline",
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        # 大文件和 Range 请求交给 FileResponse 处理
+        if stat_result.st_size > _CACHE_MAX_FILE_SIZE or "range" in request_headers:
+            return response
+
+        content = _get_cached_file(full_path, stat_result)
+        if content is not None:
+            # 响应头（content-type/etag/last-modified/content-length）与文件响应保持一致
+            return Response(content=content, status_code=status_code, headers=response.headers)
+
+        # 未命中：本次仍按文件发送，发送完成后再把内容读入缓存
+        response.background = BackgroundTask(_cache_file, full_path, stat_result)
+        return response
+
+
+# 以 ASGI 应用挂载到 /api/static，由 Starlette 完成：
+# - 单次 stat 判断文件是否存在及是否为普通文件（目录返回 404）
+# - 拒绝跳出 projects_root 的路径（包括 .. 和指向外部的符号链接）
+# - ETag / Last-Modified 以及 If-None-Match / If-Modified-Since 的 304 响应
+# 项目根目录在首次请求时才检查，启动时可以尚不存在
+static_files = ProjectStaticFiles(directory=settings.projects_root, check_dir=False)
@@ -14,7 +14,5 @@ class AgentType(str, Enum):
 
     @classmethod
     def from_value(cls,value : str):
-        for item in cls:
-            if item.value == value:
-                return item
-        return None
+        # Enum 自带 value -> 成员 的映射，O(1) 查找
+        return cls._value2member_map_.get(value)
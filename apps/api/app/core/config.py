@@ -1,38 +1,22 @@
-from pydantic import BaseModel
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-def find_project_root() -> Path:
-    """
-    Find the project root directory by looking for specific marker files.
-    This ensures consistent behavior regardless of where the API is executed from.
-    """
-    current_path = Path(__file__).resolve()
-    
-    # Start from current file and go up
-    for parent in [current_path] + list(current_path.parents):
-        # Check if this directory has both apps/ and Makefile (project root indicators)
-        if (parent / 'apps').is_dir() and (parent / 'Makefile').exists():
-            return parent
-    
-    # Fallback: navigate up from apps/api to project root
-    # Current path is likely: /project-root/apps/api/app/core/config.py
-    # So we need to go up 4 levels: config.py -> core -> app -> api -> apps -> project-root
-    api_dir = current_path.parent.parent.parent  # /project-root/apps/api
-    if api_dir.name == 'api' and api_dir.parent.name == 'apps':
-        return api_dir.parent.parent  # /project-root
-    
-    # Last resort: current working directory
-    return Path.cwd()
-
+# 项目布局固定：本文件位于 <project-root>/apps/api/app/core/config.py
+# 部署目录不同时可通过 PROJECT_ROOT 环境变量覆盖
+_DEFAULT_PROJECT_ROOT = Path(__file__).resolve().parents[4]
 
 # Get project root once at module load
-PROJECT_ROOT = find_project_root()
+PROJECT_ROOT = Path(os.environ.get("PROJECT_ROOT") or _DEFAULT_PROJECT_ROOT)
 load_dotenv(os.path.join(PROJECT_ROOT,".env"))
 
 
 class Settings(BaseModel):
+    # 环境变量在模块加载时读取一次；实例不可修改，可在各处安全共享
+    model_config = ConfigDict(frozen=True)
+
     api_port: int = int(os.getenv("API_PORT", "8080"))
 
     # SQLite database URL
@@ -79,6 +63,13 @@ class Settings(BaseModel):
     export_timeout: int = int(os.getenv("EXPORT_TIMEOUT", "300"))
     export_log_level: str = os.getenv("EXPORT_LOG_LEVEL", "INFO")
 
+    # Redis 连接地址（用于多 worker 共享评测状态，为空时使用进程内存储）
+    redis_url: str = os.getenv("REDIS_URL", "")
+
+    # 评测任务并发数与排队上限
+    eval_concurrency: int = int(os.getenv("EVAL_CONCURRENCY", "4"))
+    eval_max_queue: int = int(os.getenv("EVAL_MAX_QUEUE", "32"))
+
     # MCP服务URL（仅用于数据传输服务）
     mcp_data_transmission_url: str = os.getenv("MCP_DATA_TRANSMISSION_URL", "")
 
@@ -88,4 +79,10 @@ class Settings(BaseModel):
 
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """返回进程内唯一的 Settings 实例（可用作 FastAPI 依赖）"""
+    return Settings()
+
+
+settings = get_settings()
\ No newline at end of file
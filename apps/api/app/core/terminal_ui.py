@@ -3,6 +3,7 @@ Clean Terminal UI System
 Inspired by Claude Code's design principles
 """
 import logging
+import os
 from typing import Optional, Dict, Any
 from enum import Enum
 from rich.console import Console
@@ -28,6 +29,9 @@ class TerminalUI:
     
     def __init__(self):
         self.console = Console(file=sys.stdout, force_terminal=True)
+        # Debug output follows the DEBUG env flag (same switch as configure_logging).
+        # Callers building expensive debug messages should check this first.
+        self.debug_enabled = os.getenv("DEBUG", "false").lower() == "true"
         self._setup_colors()
     
     def _setup_colors(self):
@@ -62,8 +66,9 @@ class TerminalUI:
         self.console.print(text)
     
     def debug(self, message: str, component: Optional[str] = None):
-        """Debug level message"""
-        self.log(message, LogLevel.DEBUG, component)
+        """Debug level message (dropped unless debug_enabled)"""
+        if self.debug_enabled:
+            self.log(message, LogLevel.DEBUG, component)
     
     def info(self, message: str, component: Optional[str] = None):
         """Info level message"""
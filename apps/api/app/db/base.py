@@ -1,5 +1,35 @@
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.functions import FunctionElement
 
 
 class Base(DeclarativeBase):
     pass
+
+
+class utcnow(FunctionElement):
+    """
+    数据库端的当前 UTC 时间（naive），与 Python 端 datetime.utcnow() 语义一致
+
+    func.now() 在 PostgreSQL 的 timestamp without time zone 列中存的是会话时区的本地时间，
+    因此按方言显式取 UTC
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite 的 CURRENT_TIMESTAMP 即为 UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "mysql")
+def _utcnow_mysql(element, compiler, **kw):
+    return "UTC_TIMESTAMP()"
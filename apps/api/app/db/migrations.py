@@ -1,24 +1,46 @@
 """Database migrations module for SQLite."""
 
 import logging
-from pathlib import Path
 from typing import Optional
 
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
 logger = logging.getLogger(__name__)
 
+# 模型中已移除、但旧数据库中仍存在的索引
+_OBSOLETE_INDEXES = (
+    # 与 authorized_users 主键索引重复
+    "ix_authorized_users_cert_fingerprint",
+    # 被 ix_backtest_strategy_created 的前导列覆盖
+    "ix_backtest_results_strategy_id",
+)
+
 
-def run_sqlite_migrations(db_path: Optional[str] = None) -> None:
+def run_sqlite_migrations(engine: Optional[Engine] = None) -> None:
     """
     Run SQLite database migrations.
-    
+
+    ``Base.metadata.create_all`` only creates indexes together with new
+    tables, so indexes added to existing models are created here, and
+    indexes removed from models are dropped.
+
     Args:
-        db_path: Path to the SQLite database file
+        engine: SQLAlchemy engine bound to the SQLite database
     """
-    if db_path:
-        logger.info(f"Running migrations for SQLite database at: {db_path}")
-    else:
-        logger.info("Running migrations for in-memory SQLite database")
-    
-    # Add migration logic here as needed
-    # For now, this is a placeholder that ensures the module exists
-    pass
\ No newline at end of file
+    if engine is None:
+        logger.info("No database engine provided, skipping migrations")
+        return
+
+    logger.info(f"Running migrations for SQLite database at: {engine.url.database}")
+
+    from app.db.base import Base
+    import app.models  # noqa: F401  ensure all models are registered
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        for index_name in _OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
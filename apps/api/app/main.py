@@ -1,5 +1,6 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.api.projects import router as projects_router
@@ -13,7 +14,7 @@ from app.api.settings import router as settings_router
 from app.api.project_services import router as project_services_router
 from app.api.github import router as github_router
 from app.api.vercel import router as vercel_router
-from app.api.static import router as static_router
+from app.api.static import static_files
 from app.api.auth import router as auth_router
 from app.api.evaluation import router as evaluation_router
 from app.core.logging import configure_logging
@@ -22,6 +23,8 @@ from sqlalchemy import inspect
 from app.db.base import Base
 from app.db.session import engine
 from app.db.migrations import run_sqlite_migrations
+from app.services.evaluation_queue import evaluation_queue
+from app.services.claude_act import warm_system_prompts
 import os
 
 
@@ -57,6 +60,10 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+# Compress larger text responses (traces, reports, project lists)
+# starlette>=0.47 (requirements.txt) leaves text/event-stream uncompressed and passes pathsend through
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Routers
 app.include_router(projects_router, prefix="/api/projects")
 app.include_router(repo_router)
@@ -69,7 +76,7 @@ app.include_router(settings_router)  # Settings API
 app.include_router(project_services_router)  # Project services API
 app.include_router(github_router)  # GitHub integration API
 app.include_router(vercel_router)  # Vercel integration API
-app.include_router(static_router,prefix="/api/static") # static web API
+app.mount("/api/static", static_files, name="static")  # static web API
 app.include_router(auth_router)  # User authorization API
 app.include_router(evaluation_router)  # Agent trace & evaluation API
 
@@ -90,6 +97,12 @@ def on_startup() -> None:
     # Run lightweight SQLite migrations for additive changes
     run_sqlite_migrations(engine)
 
+    # Start bounded evaluation workers
+    evaluation_queue.start()
+
+    # Render system prompts up front so the first request per agent skips it
+    warm_system_prompts()
+
     # Show available endpoints
     ui.info("API server ready")
     ui.panel(
@@ -108,3 +121,8 @@ def on_startup() -> None:
         "Port": os.getenv("PORT", "8000")
     }
     ui.status_line(env_info)
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await evaluation_queue.stop()
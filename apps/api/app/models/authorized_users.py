@@ -1,15 +1,15 @@
-from sqlalchemy import String, DateTime, Boolean
+from sqlalchemy import String, DateTime, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 
 class AuthorizedUser(Base):
     """授权用户模型 - 存储有权限使用系统的用户证书指纹"""
     __tablename__ = "authorized_users"
 
-    # 证书指纹作为主键 (32位MD5哈希值的大写字符串)
-    cert_fingerprint: Mapped[str] = mapped_column(String(32), primary_key=True, index=True)
+    # 证书指纹作为主键 (32位MD5哈希值的大写字符串)，主键自带唯一索引，无需额外索引
+    cert_fingerprint: Mapped[str] = mapped_column(String(32), primary_key=True)
 
     # 用户标识信息（可选）
     user_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -21,9 +21,19 @@ class AuthorizedUser(Base):
     # 备注信息
     remark: Mapped[str | None] = mapped_column(String(512), nullable=True)
 
-    # 时间戳
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # 时间戳（naive UTC，由数据库在 INSERT/UPDATE 语句中生成，不经 Python 调用和绑定参数）
+    # 使用 utcnow() 而非 func.now()：后者在 PostgreSQL 中存的是会话时区的本地时间
+    # default 以 SQL 表达式内联到语句中，旧库中没有 DEFAULT 的表同样适用
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow(), nullable=False)
+
+    # 覆盖鉴权查询 (cert_fingerprint, is_active) 的复合索引
+    __table_args__ = (
+        Index('ix_authuser_fp_active', 'cert_fingerprint', 'is_active'),
+    )
+
+    # flush 时通过 RETURNING 取回数据库生成的时间戳，避免访问时再 SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     def __repr__(self) -> str:
         return f"<AuthorizedUser(cert_fingerprint={self.cert_fingerprint!r}, user_name={self.user_name!r}, is_active={self.is_active})>"
@@ -1,7 +1,7 @@
 """
 Unified message model for all chat, Claude Code SDK, and tool interactions
 """
-from sqlalchemy import String, DateTime, ForeignKey, Text, JSON, Integer, Numeric, Boolean
+from sqlalchemy import String, DateTime, ForeignKey, Text, JSON, Integer, Numeric, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.base import Base
@@ -46,4 +46,9 @@ class Message(Base):
     # Relationships
     project = relationship("Project", back_populates="messages")
     parent_message = relationship("Message", remote_side=[id], backref="replies")
-    session = relationship("Session", back_populates="messages")
\ No newline at end of file
+    session = relationship("Session", back_populates="messages")
+
+    # Per-project aggregation (count / min / max created_at) for trace listings
+    __table_args__ = (
+        Index('ix_messages_project_created', 'project_id', 'created_at'),
+    )
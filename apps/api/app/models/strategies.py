@@ -2,10 +2,15 @@
 Database models for financial strategies and backtest results.
 """
 
-from sqlalchemy import String, DateTime, Text, JSON, Float, Integer, ForeignKey
+from sqlalchemy import String, DateTime, Text, JSON, Float, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
-from app.db.base import Base
+from app.db.base import Base, utcnow
+
+# JSON on SQLite (TEXT + JSON1 functions), binary JSONB on PostgreSQL so values are
+# parsed once on write and single keys can be read server-side with -> / ->>
+JSONType = JSON().with_variant(JSONB(), "postgresql")
 
 
 class Strategy(Base):
@@ -22,7 +27,7 @@ class Strategy(Base):
     strategy_type: Mapped[str] = mapped_column(String(64), nullable=False)  # sma, rsi, macd, bollinger, custom
 
     # Strategy parameters
-    parameters: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    parameters: Mapped[dict] = mapped_column(JSONType, nullable=False, default=dict)
 
     # Strategy code (for custom strategies)
     code: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -30,9 +35,13 @@ class Strategy(Base):
     # Status
     status: Mapped[str] = mapped_column(String(32), default="draft", nullable=False)  # draft, active, archived
 
-    # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Timestamps (naive UTC, stamped by the database inside the INSERT/UPDATE statement;
+    # utcnow() rather than func.now(), which stores session-local time on PostgreSQL)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False, index=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow(), nullable=False)
+
+    # Fetch database-generated timestamps with RETURNING on flush
+    __mapper_args__ = {"eager_defaults": True}
 
     # Relationships
     backtest_results = relationship("BacktestResult", back_populates="strategy", cascade="all, delete-orphan")
@@ -44,7 +53,8 @@ class BacktestResult(Base):
     __tablename__ = "backtest_results"
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
-    strategy_id: Mapped[str] = mapped_column(String(64), ForeignKey("strategies.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Indexed by ix_backtest_strategy_created (leading column)
+    strategy_id: Mapped[str] = mapped_column(String(64), ForeignKey("strategies.id", ondelete="CASCADE"), nullable=False)
 
     # Backtest configuration
     symbol: Mapped[str] = mapped_column(String(32), nullable=False)
@@ -74,16 +84,26 @@ class BacktestResult(Base):
     annual_return: Mapped[float | None] = mapped_column(Float, nullable=True)
     sqn: Mapped[float | None] = mapped_column(Float, nullable=True)
 
-    # Full results JSON
-    detailed_results: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Full results JSON; deferred so list queries only load the scalar metrics
+    # (use undefer(BacktestResult.detailed_results) when a query needs it)
+    detailed_results: Mapped[dict | None] = mapped_column(JSONType, nullable=True, deferred=True)
 
     # Status
     status: Mapped[str] = mapped_column(String(32), default="completed", nullable=False)  # running, completed, failed
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Timestamps (naive UTC, stamped by the database inside the INSERT statement)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False, index=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     # Relationships
     strategy = relationship("Strategy", back_populates="backtest_results")
+
+    # "Latest backtests for a strategy" is an index range scan (read backwards for DESC)
+    # instead of filter + sort; also serves lookups by strategy_id alone
+    __table_args__ = (
+        Index('ix_backtest_strategy_created', 'strategy_id', 'created_at'),
+    )
+
+    # Fetch database-generated timestamps with RETURNING on flush
+    __mapper_args__ = {"eager_defaults": True}
@@ -1,13 +1,15 @@
 import os
 from tempfile import template
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 from app.common.types import AgentType
 
+# 编译后的模版字节码缓存在临时目录（按用户隔离），进程重启后无需重新解析编译模版
 env = Environment(
     loader=FileSystemLoader(os.path.dirname(__file__)),
     autoescape=select_autoescape(),
     trim_blocks=True,
-    lstrip_blocks=True
+    lstrip_blocks=True,
+    bytecode_cache=FileSystemBytecodeCache()
 )
 
 def getPrompt( agent_type : AgentType, ** args ) -> str:
@@ -16,5 +18,10 @@ def getPrompt( agent_type : AgentType, ** args ) -> str:
     agent_type: 智能体类型
     args: 模版参数 要跟prompt中的模版占位符一致
     """
-    template = env.get_template(f"system-prompt-{agent_type.value}.md")
-    return template.render(args)
\ No newline at end of file
+    template = env.get_template(get_template_name(agent_type))
+    return template.render(args)
+
+
+def get_template_name(agent_type : AgentType) -> str:
+    """智能体对应的 prompt 模版文件名"""
+    return f"system-prompt-{agent_type.value}.md"
\ No newline at end of file
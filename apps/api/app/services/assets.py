@@ -1,19 +1,53 @@
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO
+
+# 流式写入时的分块大小
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Directories already created by this process, so repeated writes skip the mkdir syscall
+_ensured_dirs: set[str] = set()
+_ensured_lock = threading.Lock()
 
 
 def ensure_dir(path: str) -> None:
-    Path(path).mkdir(parents=True, exist_ok=True)
+    if path in _ensured_dirs:
+        return
+    with _ensured_lock:
+        if path not in _ensured_dirs:
+            Path(path).mkdir(parents=True, exist_ok=True)
+            _ensured_dirs.add(path)
+
+
+def _open_for_write(path: str, mode: str, **kwargs):
+    parent = os.path.dirname(path)
+    ensure_dir(parent)
+    try:
+        return open(path, mode, **kwargs)
+    except FileNotFoundError:
+        # Directory was removed after it was cached (e.g. project deleted); recreate it
+        with _ensured_lock:
+            _ensured_dirs.discard(parent)
+        ensure_dir(parent)
+        return open(path, mode, **kwargs)
 
 
 def write_bytes(path: str, data: bytes) -> None:
-    ensure_dir(str(Path(path).parent))
-    with open(path, "wb") as f:
+    with _open_for_write(path, "wb") as f:
         f.write(data)
 
 
+def write_stream(path: str, src: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+    """Copy a file-like object to disk in chunks and return the bytes written."""
+    size = 0
+    with _open_for_write(path, "wb") as f:
+        while chunk := src.read(chunk_size):
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
 def write_text(path: str, data: str) -> None:
-    ensure_dir(str(Path(path).parent))
-    with open(path, "w", encoding="utf-8") as f:
+    with _open_for_write(path, "w", encoding="utf-8") as f:
         f.write(data)
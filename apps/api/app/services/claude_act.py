@@ -38,6 +38,10 @@ def find_prompt_file() -> Path:
     return prompt_file
 
 
+# 已加载的 system prompt，按智能体类型分别缓存
+_prompt_cache: dict[AgentType, str] = {}
+
+
 def load_system_prompt(force_reload: bool = False,agent_type:AgentType = AgentType.ANALYIS) -> str:
     """
     Load system prompt from app/prompt/system-prompt.md file.
@@ -45,15 +49,16 @@ def load_system_prompt(force_reload: bool = False,agent_type:AgentType = AgentTy
 
     Args:
         force_reload: If True, ignores cache and reloads from file
+        agent_type: Agent whose prompt template is rendered (cached per agent type)
     """
     # Simple caching mechanism
-    if not force_reload and hasattr(load_system_prompt, '_cached_prompt'):
-        return load_system_prompt._cached_prompt
+    if not force_reload and agent_type in _prompt_cache:
+        return _prompt_cache[agent_type]
 
     try:
         prompt_content = prompt_util.getPrompt(agent_type)
         # Cache the loaded prompt
-        load_system_prompt._cached_prompt = prompt_content
+        _prompt_cache[agent_type] = prompt_content
         return prompt_content
 
     except Exception as e:
@@ -73,10 +78,18 @@ def load_system_prompt(force_reload: bool = False,agent_type:AgentType = AgentTy
     )
 
     print(f"🔄 Using fallback system prompt ({len(fallback_prompt)} chars)")
-    load_system_prompt._cached_prompt = fallback_prompt
+    _prompt_cache[agent_type] = fallback_prompt
     return fallback_prompt
 
 
+def warm_system_prompts() -> None:
+    """Render and cache the system prompt of every agent type that has a template"""
+    available = set(prompt_util.env.list_templates())
+    for agent_type in AgentType:
+        if prompt_util.get_template_name(agent_type) in available:
+            load_system_prompt(True, agent_type)
+
+
 def get_system_prompt(agent_type: AgentType) -> str:
     """Get the current system prompt (uses cached version)"""
     return load_system_prompt(False,agent_type)
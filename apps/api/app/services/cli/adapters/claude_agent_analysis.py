@@ -5,8 +5,9 @@ Moved from unified_manager.py to a dedicated adapter module.
 from __future__ import annotations
 
 import os
-from datetime import datetime
-from typing import Any, Dict, Optional, override
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, override
 
 from app.core.terminal_ui import ui
 from claude_agent_sdk import ClaudeAgentOptions
@@ -15,32 +16,59 @@ from app.common.types import AgentType
 from app.prompt import prompt_util
 from app.core.config import settings
 
-from ..base import MODEL_MAPPING, BaseCLI
+from ..base import MODEL_MAPPING, BaseCLI, current_date_str
 from app.services.tools import sql_tools_server,report_tools_server,fin_sql_tools_server
 
 
+# 允许使用的工具，固定不变，导入时构建一次
+_ALLOWED_TOOLS = (
+    "Read",
+    "Write",
+    "Edit",
+    "MultiEdit",
+    "Bash",
+    "Glob",
+    "Grep",
+    "LS",
+    "WebFetch",
+    "WebSearch",
+    "TodoWrite",
+    "Skill",
+)
+
+
+@lru_cache(maxsize=128)
+def _render_system_prompt(project_path: str, current_date: str) -> str:
+    """渲染 system prompt，按 (项目路径, 日期) 缓存，日期变化后自动重新渲染"""
+    return prompt_util.getPrompt(AgentType.ANALYIS,
+                                 project_path = project_path,
+                                 current_date = current_date,
+                                 python_home= settings.python_home)
+
+
 class ClaudeAgentCLIAnalysis(BaseCLI):
     """Claude Agent Python SDK implementation"""
 
     def __init__(self):
         super().__init__(AgentType.ANALYIS)
         self.cli = None
-        self.session_mapping: Dict[str, str] = {}
+        self._availability: Optional[Mapping[str, Any]] = None
 
-    async def check_availability(self) -> Dict[str, Any]:
+    async def check_availability(self) -> Mapping[str, Any]:
         """Check if Claude Agent SDK is available"""
-        
-        return {
-            "available": True,
-            "configured": True,
-            "mode": "SDK",
-            "models": self.get_supported_models(),
-            "default_models": [
-                "claude-sonnet-4-5-20250929",
-                "claude-opus-4-1-20250805",
-            ],
-        }
-        
+        # 结果固定不变，首次调用时构建一次，之后直接返回只读映射
+        if self._availability is None:
+            self._availability = MappingProxyType({
+                "available": True,
+                "configured": True,
+                "mode": "SDK",
+                "models": tuple(self.get_supported_models()),
+                "default_models": (
+                    "claude-sonnet-4-5-20250929",
+                    "claude-opus-4-1-20250805",
+                ),
+            })
+        return self._availability
 
     @override
     def init_claude_option(self,
@@ -49,43 +77,26 @@ class ClaudeAgentCLIAnalysis(BaseCLI):
                        model: Optional[str] = None) -> ClaudeAgentOptions:
         """connect and return Claude Agent SDK client"""
         # Load system prompt···
+        project_path = os.path.join(settings.projects_root,project_id)
         try:
-            project_path = os.path.join(settings.projects_root,project_id)
-            system_prompt = prompt_util.getPrompt(AgentType.ANALYIS,
-                                                  project_path = project_path,
-                                                  current_date = datetime.now().strftime("%Y-%m-%d"),
-                                                  python_home= settings.python_home)
+            system_prompt = _render_system_prompt(project_path, current_date_str())
             ui.debug(f"System prompt loaded: {len(system_prompt)} chars", "Claude Agent SDK")
         except Exception as e:
             ui.error(f"Failed to load system prompt: {e}", "Claude Agent SDK")
             system_prompt = (
                 "You are Claude Agent, an AI coding assistant specialized in building modern web applications."
             )
-        allowed_tools = [
-            "Read",
-            "Write",
-            "Edit",
-            "MultiEdit",
-            "Bash",
-            "Glob",
-            "Grep",
-            "LS",
-            "WebFetch",
-            "WebSearch",
-            "TodoWrite",
-            "Skill"
-            ]
         # Get CLI-specific model name
         cli_model = "claude-sonnet-4-5-20250929" if model is None else MODEL_MAPPING.get(model,"claude-sonnet-4-5-20250929")
         options = ClaudeAgentOptions(
             system_prompt=system_prompt,
-            allowed_tools=allowed_tools,
+            allowed_tools=_ALLOWED_TOOLS,
             mcp_servers={"sql":sql_tools_server,"fin-sql":fin_sql_tools_server,"report":report_tools_server},
             permission_mode="bypassPermissions",
             model=cli_model,
             continue_conversation=True,
             setting_sources=["user", "project", "local"],
-            cwd=os.path.join(settings.projects_root,project_id),
+            cwd=project_path,
             env={
                     "NODE_TLS_REJECT_UNAUTHORIZED": "0"
                 }
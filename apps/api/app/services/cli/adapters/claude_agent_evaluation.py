@@ -5,12 +5,16 @@ This adapter evaluates the quality of data analysis agent execution sessions.
 from __future__ import annotations
 
 import asyncio
-import json
 import os
-import uuid
+import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, override
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Callable, Dict, List, Mapping, Optional, Tuple, override
+
+import orjson
 
 from app.core.terminal_ui import ui
 from app.models.messages import Message
@@ -19,7 +23,7 @@ from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions
 from app.common.types import AgentType
 from app.core.config import settings, PROJECT_ROOT
 
-from ..base import MODEL_MAPPING, BaseCLI
+from ..base import MODEL_MAPPING, BaseCLI, current_date_str, new_message_id
 from claude_agent_sdk.types import (
     SystemMessage,
     AssistantMessage,
@@ -32,6 +36,70 @@ from claude_agent_sdk.types import (
 from app.services.tools import sql_tools_server,report_tools_server
 
 
+# Use PROJECT_ROOT from config
+_EVALUATION_PROMPT_PATH = PROJECT_ROOT / "apps" / "api" / "app" / "prompt" / "system-prompt-analysis-evaluation.md"
+
+# prompt 中的模板变量 {{name}}，预编译后一次替换完成
+_TEMPLATE_VAR_PATTERN = re.compile(r"\{\{(project_path|current_date|trace_file_path|reference_answer)\}\}")
+
+# 允许使用的工具，固定不变，导入时构建一次
+_ALLOWED_TOOLS = (
+    "Read",
+    "Write",
+    "Edit",
+    "MultiEdit",
+    "Bash",
+    "Glob",
+    "Grep",
+    "LS",
+    "WebFetch",
+    "WebSearch",
+    "TodoWrite",
+    "mcp__sql__download_sql_result",
+    "mcp__sql__preview_sql_result",
+    "mcp__report__preview_report_data",
+    "mcp__report__download_report_data",
+)
+
+# CLI 子进程的环境变量，SDK 只读取不修改
+_BASE_ENV = {"NODE_TLS_REJECT_UNAUTHORIZED": "0"}
+
+# 评估可用的模型：MODEL_MAPPING 中去重后的模型名，保持定义顺序
+_SUPPORTED_MODELS: Tuple[str, ...] = tuple(dict.fromkeys(MODEL_MAPPING.values()))
+
+# claude_agent_sdk 在模块导入时已加载（缺失时本模块无法导入），可用性结果固定不变，
+# 导入时构建一次只读映射，之后直接返回
+_AVAILABILITY: Mapping[str, Any] = MappingProxyType({
+    "available": True,
+    "configured": True,
+    "mode": "Evaluation",
+    "models": _SUPPORTED_MODELS,
+    "default_models": (
+        "claude-sonnet-4-5-20250929",
+        "claude-opus-4-1-20250805",
+    ),
+})
+
+
+@lru_cache(maxsize=1)
+def _read_evaluation_prompt(prompt_path: str) -> str:
+    """读取评估 prompt 文件，运行期间内容不变，按路径缓存，只在首次读取时记录日志"""
+    path = Path(prompt_path)
+    if ui.debug_enabled:
+        ui.debug(f"Prompt directory: {path.parent}", "Evaluation")
+
+    if not path.exists():
+        raise FileNotFoundError(f"Evaluation prompt not found: {path}")
+
+    ui.success(f"Using evaluation prompt: {path.name}", "Evaluation")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        system_prompt = f.read()
+
+    ui.success(f"Loaded evaluation prompt: {len(system_prompt)} chars", "Evaluation")
+    return system_prompt
+
+
 class ClaudeAgentEvaluation():
     """Claude Agent Evaluation implementation for assessing agent execution quality"""
 
@@ -42,26 +110,22 @@ class ClaudeAgentEvaluation():
         # Load evaluation prompt to use in instructions (Windows compatibility)
         self.evaluation_prompt = self._load_evaluation_prompt()
 
+        # Streamed SDK messages are dispatched by exact class, falling back to
+        # the class name when the SDK hands back an unregistered class
+        self._message_handlers = {
+            SystemMessage: self._handle_system_message,
+            AssistantMessage: self._handle_assistant_message,
+            UserMessage: self._handle_user_message,
+            ResultMessage: self._handle_result_message,
+        }
+        self._message_handlers_by_name = {
+            cls.__name__: handler for cls, handler in self._message_handlers.items()
+        }
+
     def _load_evaluation_prompt(self) -> str:
         """Load evaluation prompt from file"""
         try:
-            # Use PROJECT_ROOT from config
-            prompt_dir = PROJECT_ROOT / "apps" / "api" / "app" / "prompt"
-            ui.debug(f"Prompt directory: {prompt_dir}", "Evaluation")
-
-            # Load the evaluation prompt
-            prompt_path = prompt_dir / "system-prompt-analysis-evaluation.md"
-
-            if not prompt_path.exists():
-                raise FileNotFoundError(f"Evaluation prompt not found: {prompt_path}")
-
-            ui.success(f"Using evaluation prompt: {prompt_path.name}", "Evaluation")
-
-            with open(prompt_path, 'r', encoding='utf-8') as f:
-                system_prompt = f.read()
-
-            ui.success(f"Loaded evaluation prompt: {len(system_prompt)} chars", "Evaluation")
-            return system_prompt
+            return _read_evaluation_prompt(str(_EVALUATION_PROMPT_PATH))
         except Exception as e:
             ui.error(f"Failed to load evaluation prompt: {e}", "Evaluation")
             return (
@@ -74,14 +138,14 @@ class ClaudeAgentEvaluation():
         try:
             # Format tool input nicely
             if isinstance(tool_input, dict):
-                # Show key parameters only
+                # Show key parameters only (max 3 params, the rest are never formatted)
                 key_params = []
-                for key, value in tool_input.items():
-                    if isinstance(value, str) and len(value) > 50:
-                        key_params.append(f"{key}=<{len(value)} chars>")
+                for key, value in islice(tool_input.items(), 3):
+                    if isinstance(value, str) and (length := len(value)) > 50:
+                        key_params.append(f"{key}=<{length} chars>")
                     else:
                         key_params.append(f"{key}={value}")
-                params = ", ".join(key_params[:3])  # Show max 3 params
+                params = ", ".join(key_params)
                 if len(tool_input) > 3:
                     params += ", ..."
                 return f"Tool: {tool_name}({params})"
@@ -90,40 +154,14 @@ class ClaudeAgentEvaluation():
         except Exception as e:
             return f"Tool: {tool_name} (display error: {e})"
 
-    def get_supported_models(self) -> List[str]:
+    def get_supported_models(self) -> Tuple[str, ...]:
         """Get list of supported Claude models for evaluation"""
         # Return all available Claude models from MODEL_MAPPING
-        return list(set(MODEL_MAPPING.values()))
+        return _SUPPORTED_MODELS
 
-    async def check_availability(self) -> Dict[str, Any]:
+    async def check_availability(self) -> Mapping[str, Any]:
         """Check if Claude Agent SDK is available"""
-        try:
-            import claude_agent_sdk
-            return {
-                "available": True,
-                "configured": True,
-                "mode": "Evaluation",
-                "models": self.get_supported_models(),
-                "default_models": [
-                    "claude-sonnet-4-5-20250929",
-                    "claude-opus-4-1-20250805",
-                ],
-            }
-        except ImportError:
-            return {
-                "available": True,
-                "configured": True,
-                "mode": "Evaluation (Development Mode)",
-                "models": self.get_supported_models(),
-                "default_models": [
-                    "claude-sonnet-4-5-20250929",
-                    "claude-opus-4-1-20250805",
-                ],
-                "warning": (
-                    "Claude Agent SDK not installed. Running in development mode.\n"
-                    "To install: pip install claude-agent-sdk>=0.1.2"
-                ),
-            }
+        return _AVAILABILITY
 
     def init_claude_option(self,
                        project_id: str,
@@ -131,49 +169,29 @@ class ClaudeAgentEvaluation():
                        model: Optional[str] = None) -> ClaudeAgentOptions:
         """connect and return Claude Agent SDK client"""
 
-        allowed_tools = [
-            "Read",
-            "Write",
-            "Edit",
-            "MultiEdit",
-            "Bash",
-            "Glob",
-            "Grep",
-            "LS",
-            "WebFetch",
-            "WebSearch",
-            "TodoWrite",
-            "mcp__sql__download_sql_result",
-            "mcp__sql__preview_sql_result",
-            "mcp__report__preview_report_data",
-            "mcp__report__download_report_data",
-            ]
         # Get CLI-specific model name
         cli_model = "claude-sonnet-4-5-20250929" if model is None else MODEL_MAPPING.get(model,"claude-sonnet-4-5-20250929")
 
         # Determine working directory - ensure it exists
         project_path = os.path.join(settings.projects_root, project_id)
-        if not os.path.exists(project_path):
-            # If project directory doesn't exist, create it
-            try:
-                os.makedirs(project_path, exist_ok=True)
-                ui.info(f"Created project directory: {project_path}", "Evaluation")
-            except Exception as e:
-                # If we can't create it, use projects_root as fallback
-                ui.warning(f"Failed to create project directory: {e}, using projects_root", "Evaluation")
-                project_path = settings.projects_root
+        # Projects can be deleted (cleanup_project), so check every call;
+        # makedirs with exist_ok is a single syscall when the directory exists
+        try:
+            os.makedirs(project_path, exist_ok=True)
+        except Exception as e:
+            # If we can't create it, use projects_root as fallback
+            ui.warning(f"Failed to create project directory: {e}, using projects_root", "Evaluation")
+            project_path = settings.projects_root
 
         options = ClaudeAgentOptions(
             system_prompt=None,
-            allowed_tools=allowed_tools,
+            allowed_tools=_ALLOWED_TOOLS,
             mcp_servers={"sql":sql_tools_server,"report":report_tools_server},
             permission_mode="bypassPermissions",
             model=cli_model,
             setting_sources=["user", "project", "local"],
             cwd=project_path,
-            env={
-                    "NODE_TLS_REJECT_UNAUTHORIZED": "0"
-                }
+            env=_BASE_ENV,
         )
         return options
 
@@ -201,8 +219,9 @@ class ClaudeAgentEvaluation():
             Message objects with evaluation progress and results
         """
         ui.info("Starting trace evaluation", "Evaluation")
-        ui.debug(f"Trace file: {trace_file_path}", "Evaluation")
-        ui.debug(f"Project ID: {project_id}", "Evaluation")
+        if ui.debug_enabled:
+            ui.debug(f"Trace file: {trace_file_path}", "Evaluation")
+            ui.debug(f"Project ID: {project_id}", "Evaluation")
         if reference_answer:
             ui.info(f"Reference answer provided ({len(reference_answer)} chars)", "Evaluation")
 
@@ -212,7 +231,7 @@ class ClaudeAgentEvaluation():
             error_msg = f"Trace file not found: {trace_file_path}"
             ui.error(error_msg, "Evaluation")
             yield Message(
-                id=str(uuid.uuid4()),
+                id=new_message_id(),
                 project_id=project_id,
                 role="system",
                 message_type="error",
@@ -225,14 +244,17 @@ class ClaudeAgentEvaluation():
 
         # Load trace data
         try:
-            with open(trace_path, 'r', encoding='utf-8') as f:
-                trace_data = json.load(f)
-            ui.success(f"Loaded trace data: {trace_data.get('statistics', {}).get('total_messages', 0)} messages", "Evaluation")
+            # 只需校验 trace 可解析并取出消息数，用 orjson 直接解析字节，取完即释放
+            with open(trace_path, 'rb') as f:
+                trace_data = orjson.loads(f.read())
+            total_messages = trace_data.get('statistics', {}).get('total_messages', 0)
+            del trace_data
+            ui.success(f"Loaded trace data: {total_messages} messages", "Evaluation")
         except Exception as e:
             error_msg = f"Failed to parse trace file: {e}"
             ui.error(error_msg, "Evaluation")
             yield Message(
-                id=str(uuid.uuid4()),
+                id=new_message_id(),
                 project_id=project_id,
                 role="system",
                 message_type="error",
@@ -250,19 +272,23 @@ class ClaudeAgentEvaluation():
         project_path_str = os.path.join(settings.projects_root, project_id)
 
         # Get current date
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        current_date = current_date_str()
 
         # Construct evaluation instruction using template variable replacement
-        instruction = self.evaluation_prompt
-
-        # Replace template variables
-        instruction = instruction.replace("{{project_path}}", project_path_str)
-        instruction = instruction.replace("{{current_date}}", current_date)
-        instruction = instruction.replace("{{trace_file_path}}", trace_file_path)
-        instruction = instruction.replace("{{reference_answer}}", reference_answer or "")
+        template_vars = {
+            "project_path": project_path_str,
+            "current_date": current_date,
+            "trace_file_path": trace_file_path,
+            "reference_answer": reference_answer or "",
+        }
+        # 单次扫描替换所有模板变量
+        instruction = _TEMPLATE_VAR_PATTERN.sub(
+            lambda m: template_vars[m.group(1)], self.evaluation_prompt
+        )
 
-        ui.debug(f"Instruction prepared: {len(instruction)} chars", "Evaluation")
-        ui.debug(f"Variables: project_path={project_path_str}, date={current_date}", "Evaluation")
+        if ui.debug_enabled:
+            ui.debug(f"Instruction prepared: {len(instruction)} chars", "Evaluation")
+            ui.debug(f"Variables: project_path={project_path_str}, date={current_date}", "Evaluation")
 
         # Change to project root directory to access trace files
         cli_model = MODEL_MAPPING.get(model, "") or "claude-sonnet-4-5-20250929"
@@ -274,65 +300,24 @@ class ClaudeAgentEvaluation():
                 await cli.query(instruction)
             # Stream responses - only yield final report content
                 async for message_obj in cli.receive_messages():
-                    # Handle SystemMessage
-                    if isinstance(message_obj, SystemMessage) or "SystemMessage" in str(type(message_obj)):
-                        # Just log, don't yield to frontend
-                        ui.success(f"Evaluation Agent initialized (Model: {cli_model})", "Evaluation")
-
-                    # Handle AssistantMessage
-                    elif isinstance(message_obj, AssistantMessage) or "AssistantMessage" in str(type(message_obj)):
-                        content = ""
-
-                        if hasattr(message_obj, "content") and isinstance(message_obj.content, list):
-                            for block in message_obj.content:
-                                if isinstance(block, TextBlock):
-                                    content += block.text
-                                elif isinstance(block, ToolUseBlock):
-                                    tool_name = block.name
-                                    tool_input = block.input
-
-                                    # Log tool use but don't yield to frontend
-                                    tool_display = self._get_clean_tool_display(tool_name, tool_input)
-                                    ui.info(tool_display, "Evaluation")
-
-                        # Only yield text message (evaluation report content)
-                        if content and content.strip():
-                            text_message = Message(
-                                id=str(uuid.uuid4()),
-                                project_id=project_id,
-                                role="assistant",
-                                message_type="chat",
-                                content=content.strip(),
-                                metadata_json={
-                                    "cli_type": "eval",
-                                    "mode": "Evaluation",
-                                },
-                                session_id=session_id,
-                                created_at=datetime.utcnow(),
-                            )
-                            yield text_message
-
-                    # Handle UserMessage (tool results)
-                    elif isinstance(message_obj, UserMessage) or "UserMessage" in str(type(message_obj)):
-                        # Tool results - no need to show
-                        pass
-
-                    # Handle ResultMessage
-                    elif (
-                        isinstance(message_obj, ResultMessage)
-                        or "ResultMessage" in str(type(message_obj))
-                        or (hasattr(message_obj, "type") and getattr(message_obj, "type", None) == "result")
-                    ):
-                        ui.success(
-                            f"Evaluation completed in {getattr(message_obj, 'duration_ms', 0)}ms",
-                            "Evaluation",
-                        )
+                    message_cls = type(message_obj)
+                    handler = self._message_handlers.get(message_cls)
+                    if handler is None:
+                        handler = self._message_handlers_by_name.get(message_cls.__name__)
+                    if handler is None and getattr(message_obj, "type", None) == "result":
+                        handler = self._handle_result_message
+                    if handler is None:
+                        if ui.debug_enabled:
+                            ui.debug(f"Unknown message type: {message_cls}", "Evaluation")
+                        continue
+
+                    message = handler(message_obj, project_id, session_id, cli_model)
+                    if message is not None:
+                        yield message
+                    if handler == self._handle_result_message:
                         # Don't yield result message to frontend, it's already complete
                         break
 
-                    else:
-                        ui.debug(f"Unknown message type: {type(message_obj)}", "Evaluation")
-
         except Exception as e:
             # Handle any errors during evaluation
             error_msg = f"Evaluation failed: {str(e)}"
@@ -340,7 +325,7 @@ class ClaudeAgentEvaluation():
 
             # Yield error message
             error_message = Message(
-                id=str(uuid.uuid4()),
+                id=new_message_id(),
                 project_id=project_id,
                 role="system",
                 message_type="error",
@@ -353,4 +338,63 @@ class ClaudeAgentEvaluation():
                 session_id=session_id,
                 created_at=datetime.utcnow(),
             )
-            yield error_message
\ No newline at end of file
+            yield error_message
+
+    def _handle_system_message(
+        self, message_obj: Any, project_id: str, session_id: Optional[str], cli_model: str
+    ) -> Optional[Message]:
+        """SystemMessage: just log, don't yield to frontend"""
+        ui.success(f"Evaluation Agent initialized (Model: {cli_model})", "Evaluation")
+        return None
+
+    def _handle_assistant_message(
+        self, message_obj: Any, project_id: str, session_id: Optional[str], cli_model: str
+    ) -> Optional[Message]:
+        """AssistantMessage: only the text (evaluation report content) goes to the frontend"""
+        blocks = getattr(message_obj, "content", None)
+        if not isinstance(blocks, list):
+            return None
+
+        texts: List[str] = []
+        for block in blocks:
+            if isinstance(block, TextBlock):
+                texts.append(block.text)
+            elif isinstance(block, ToolUseBlock):
+                # Log tool use but don't yield to frontend
+                tool_display = self._get_clean_tool_display(block.name, block.input)
+                ui.info(tool_display, "Evaluation")
+
+        # 通常只有一个 TextBlock，直接使用，多个时一次 join
+        content = texts[0] if len(texts) == 1 else "".join(texts)
+        content = content.strip()
+        if not content:
+            return None
+        return Message(
+            id=new_message_id(),
+            project_id=project_id,
+            role="assistant",
+            message_type="chat",
+            content=content,
+            metadata_json={
+                "cli_type": "eval",
+                "mode": "Evaluation",
+            },
+            session_id=session_id,
+            created_at=datetime.utcnow(),
+        )
+
+    def _handle_user_message(
+        self, message_obj: Any, project_id: str, session_id: Optional[str], cli_model: str
+    ) -> Optional[Message]:
+        """UserMessage (tool results): no need to show"""
+        return None
+
+    def _handle_result_message(
+        self, message_obj: Any, project_id: str, session_id: Optional[str], cli_model: str
+    ) -> Optional[Message]:
+        """ResultMessage: log completion, ends the stream"""
+        ui.success(
+            f"Evaluation completed in {getattr(message_obj, 'duration_ms', 0)}ms",
+            "Evaluation",
+        )
+        return None
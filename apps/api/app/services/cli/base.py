@@ -7,9 +7,10 @@ helpers so that adding a new provider remains consistent and easy.
 from __future__ import annotations
 
 import os
+import time
 import uuid
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
 
 from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
@@ -69,6 +70,62 @@ def get_display_path(file_path: str) -> str:
     return file_path
 
 
+# Message IDs: draw randomness for a batch of UUID4s with a single os.urandom
+# call instead of one syscall per yielded message
+_MESSAGE_ID_BATCH = 64
+_message_id_pool: List[str] = []
+
+
+def new_message_id() -> str:
+    """Return a fresh random (version 4) UUID for a Message row as 32 hex chars"""
+    if not _message_id_pool:
+        raw = os.urandom(16 * _MESSAGE_ID_BATCH)
+        _message_id_pool.extend(
+            uuid.UUID(bytes=raw[i:i + 16], version=4).hex
+            for i in range(0, len(raw), 16)
+        )
+    return _message_id_pool.pop()
+
+
+# Message.created_at 是 naive UTC 列，历史与 trace 都按 created_at 排序（id 是随机的，
+# 无法打破平局），因此同一进程内发出的时间戳保证严格递增
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_last_message_timestamp = datetime.min
+
+
+def message_timestamp() -> datetime:
+    """Return a naive UTC timestamp strictly later than the previous one"""
+    global _last_message_timestamp
+    now = datetime.utcnow()
+    if now <= _last_message_timestamp:
+        now = _last_message_timestamp + _ONE_MICROSECOND
+    _last_message_timestamp = now
+    return now
+
+
+# 当前日期字符串按分钟缓存：(monotonic 分钟数, "YYYY-MM-DD")
+_today_cache: tuple[Optional[int], str] = (None, "")
+
+
+def current_date_str() -> str:
+    """Return today's date as YYYY-MM-DD, reformatted at most once a minute"""
+    global _today_cache
+    minute = int(time.monotonic() // 60)
+    if _today_cache[0] != minute:
+        _today_cache = (minute, datetime.now().strftime("%Y-%m-%d"))
+    return _today_cache[1]
+
+
+def image_reference(img: Any) -> Optional[str]:
+    """Return the path (preferred) or name of an uploaded image.
+
+    Images arrive either as ImageAttachment objects or as plain dicts.
+    """
+    if isinstance(img, dict):
+        return img.get("path") or img.get("name")
+    return getattr(img, "path", None) or getattr(img, "name", None)
+
+
 # Model mapping from unified names to CLI-specific names
 MODEL_MAPPING: Dict[str, str] = {
     "opus-4.1": "claude-opus-4-1-20250805",
@@ -134,13 +191,18 @@ class BaseCLI(ABC):
         images: Optional[List[Dict[str, Any]]] = None,
         model: Optional[str] = None,
         is_initial_prompt: bool = False
-    ) -> AsyncGenerator[Message, None]:
-        """Execute instruction using Claude Agent Python SDK"""
+    ) -> AsyncGenerator[List[Message], None]:
+        """Execute instruction using Claude Agent Python SDK
+
+        Yields the Messages produced from each SDK message as one batch, so a
+        turn with several tool calls is persisted and delivered together.
+        """
 
         ui.info("Starting Claude Agent SDK execution", "Claude Agent SDK")
-        ui.debug(f"Instruction: {instruction[:100]}...", "Claude Agent SDK")
-        ui.debug(f"Project ID: {project_id}", "Claude Agent SDK")
-        ui.debug(f"Session ID: {session_id}", "Claude Agent SDK")
+        if ui.debug_enabled:
+            ui.debug(f"Instruction: {instruction[:100]}...", "Claude Agent SDK")
+            ui.debug(f"Project ID: {project_id}", "Claude Agent SDK")
+            ui.debug(f"Session ID: {session_id}", "Claude Agent SDK")
 
          # 记录用户指令
         self.message_logger.log_user_instruction(instruction, images)
@@ -148,37 +210,23 @@ class BaseCLI(ABC):
 
         # Process images if provided
         processed_instruction = instruction
-        if images and len(images) > 0:
+        if images:
             ui.info(f"Processing {len(images)} images for Claude Agent", "Claude Agent SDK")
-            ui.debug(f"Raw images data: {images}", "Claude Agent SDK")
-            image_refs = []
-            for i, img in enumerate(images):
-                ui.debug(f"Processing image {i+1}: {img}", "Claude Agent SDK")
-                # Handle both dict and object formats
-                if hasattr(img, 'path'):
-                    # ImageAttachment object with attributes
-                    path = img.path
-                    name = img.name
-                elif isinstance(img, dict):
-                    # Dictionary format
-                    path = img.get('path')
-                    name = img.get('name')
-                else:
-                    path = None
-                    name = None
-
-                ui.debug(f"Image {i+1} - path: {path}, name: {name}", "Claude Agent SDK")
-                if path:
-                    image_refs.append(f"Image #{i+1}: {path}")
-                    ui.info(f"Added image reference: {path}", "Claude Agent SDK")
-                elif name:
-                    image_refs.append(f"Image #{i+1}: {name}")
-                    ui.info(f"Added image reference by name: {name}", "Claude Agent SDK")
+            if ui.debug_enabled:
+                ui.debug(f"Raw images data: {images}", "Claude Agent SDK")
+            # Numbering follows the upload order, including images without a path/name
+            image_refs = [
+                f"Image #{i}: {ref}"
+                for i, ref in enumerate(map(image_reference, images), 1)
+                if ref
+            ]
 
             if image_refs:
-                processed_instruction = f"{instruction}\n\nUploaded files:\n{chr(10).join(image_refs)}"
+                refs = "\n".join(image_refs)
+                processed_instruction = f"{instruction}\n\nUploaded files:\n{refs}"
                 ui.success(f"Enhanced instruction with {len(image_refs)} image references", "Claude Agent SDK")
-                ui.debug(f"Final instruction: {processed_instruction[:200]}...", "Claude Agent SDK")
+                if ui.debug_enabled:
+                    ui.debug(f"Final instruction: {processed_instruction[:200]}...", "Claude Agent SDK")
             else:
                 ui.warning("Images provided but no valid paths/names found", "Claude Agent SDK")
         else:
@@ -188,14 +236,19 @@ class BaseCLI(ABC):
         options = self.init_claude_option(project_id=project_id,
                                             model=model,
                                             claude_session_id=claude_session_id)
+        # 每条 Message 共有的 metadata 字段，每次调用只构建一次
+        base_meta = {"cli_type": self.cli_type.value, "mode": "SDK"}
         async with ClaudeSDKClient(options=options) as client:
             self.cli = client
             
             await self.cli.query(processed_instruction)
             
             async for message_obj in self.cli.receive_messages():
+                # 按类名兜底匹配时只取一次 __name__，不再逐个分支构造 str(type(...))
+                message_type_name = type(message_obj).__name__
+                batch: List[Message] = []
                 # Handle SystemMessage for session_id extraction
-                if (isinstance(message_obj, SystemMessage)or "SystemMessage" in str(type(message_obj))):
+                if (isinstance(message_obj, SystemMessage) or message_type_name == "SystemMessage"):
                     # Log message
                     self.message_logger.log_message(message_obj, "SystemMessage")
 
@@ -207,14 +260,13 @@ class BaseCLI(ABC):
                         self.message_logger.set_session_id(claude_session_id)
                     # Send init message (hidden from UI)
                     init_message = Message(
-                        id=str(uuid.uuid4()),
+                        id=new_message_id(),
                         project_id=project_id,
                         role="system",
                         message_type="system",
                         content=f"Claude Agent SDK initialized (Model: {cli_model})",
                         metadata_json={
-                            "cli_type": self.cli_type.value,
-                            "mode": "SDK",
+                            **base_meta,
                             "model": cli_model,
                             "session_id": getattr(
                                 message_obj, "session_id", None
@@ -222,19 +274,19 @@ class BaseCLI(ABC):
                             "hidden_from_ui": True,
                         },
                         session_id=session_id,
-                        created_at=datetime.utcnow(),
+                        created_at=message_timestamp(),
                     )
-                    yield init_message
+                    batch.append(init_message)
 
                 # Handle AssistantMessage (complete messages)
                 elif (
                     isinstance(message_obj, AssistantMessage)
-                    or "AssistantMessage" in str(type(message_obj))
+                    or message_type_name == "AssistantMessage"
                 ):
                     # Log message
                     self.message_logger.log_message(message_obj, "AssistantMessage")
 
-                    content = ""
+                    text_parts: List[str] = []
                     # Process content - AssistantMessage has content: list[ContentBlock]
                     if hasattr(message_obj, "content") and isinstance(
                         message_obj.content, list
@@ -242,7 +294,7 @@ class BaseCLI(ABC):
                         for block in message_obj.content:
                             if isinstance(block, TextBlock):
                                 # TextBlock has 'text' attribute
-                                content += block.text
+                                text_parts.append(block.text)
                             elif isinstance(block, ToolUseBlock):
                                 # ToolUseBlock has 'id', 'name', 'input' attributes
                                 tool_name = block.name
@@ -254,52 +306,52 @@ class BaseCLI(ABC):
 
                                 # Yield tool use message immediately
                                 tool_message = Message(
-                                    id=str(uuid.uuid4()),
+                                    id=new_message_id(),
                                     project_id=project_path,
                                     role="assistant",
                                     message_type="tool_use",
                                     content=summary,
                                     metadata_json={
-                                        "cli_type": self.cli_type.value,
-                                        "mode": "SDK",
+                                        **base_meta,
                                         "tool_name": tool_name,
                                         "tool_input": tool_input,
                                         "tool_id": tool_id,
                                     },
                                     session_id=session_id,
-                                    created_at=datetime.utcnow(),
+                                    created_at=message_timestamp(),
                                 )
                                 # Display clean tool usage like Claude Agent
                                 tool_display = self._get_clean_tool_display(
                                     tool_name, tool_input
                                 )
                                 ui.info(tool_display, "")
-                                yield tool_message
+                                batch.append(tool_message)
                             elif isinstance(block, ToolResultBlock):
                                 # Handle tool result blocks if needed
                                 pass
 
                     # Yield complete assistant text message if there's text content
-                    if content and content.strip():
+                    # Join text blocks once instead of repeated string concatenation
+                    content = "".join(text_parts).strip() if text_parts else ""
+                    if content:
                         text_message = Message(
-                            id=str(uuid.uuid4()),
+                            id=new_message_id(),
                             project_id=project_path,
                             role="assistant",
                             message_type="chat",
-                            content=content.strip(),
+                            content=content,
                             metadata_json={
-                                "cli_type": self.cli_type.value,
-                                "mode": "SDK",
+                                **base_meta,
                             },
                             session_id=session_id,
-                            created_at=datetime.utcnow(),
+                            created_at=message_timestamp(),
                         )
-                        yield text_message
+                        batch.append(text_message)
 
                 # Handle UserMessage (tool results, etc.)
                 elif (
                     isinstance(message_obj, UserMessage)
-                    or "UserMessage" in str(type(message_obj))
+                    or message_type_name == "UserMessage"
                 ):
                     # Log message
                     self.message_logger.log_message(message_obj, "UserMessage")
@@ -311,7 +363,7 @@ class BaseCLI(ABC):
                 # Handle ResultMessage (final session completion)
                 elif (
                     isinstance(message_obj, ResultMessage)
-                    or "ResultMessage" in str(type(message_obj))
+                    or message_type_name == "ResultMessage"
                     or (
                         hasattr(message_obj, "type")
                         and getattr(message_obj, "type", None) == "result"
@@ -320,8 +372,12 @@ class BaseCLI(ABC):
                     # Log message
                     self.message_logger.log_message(message_obj, "ResultMessage")
 
+                    # Snapshot the result fields once instead of a getattr per key
+                    fields = getattr(message_obj, "__dict__", None) or {}
+                    duration_ms = fields.get("duration_ms", 0)
+                    usage = fields.get("usage")
                     ui.success(
-                        f"Session completed in {getattr(message_obj, 'duration_ms', 0)}ms",
+                        f"Session completed in {duration_ms}ms",
                         "Claude Agent SDK",
                     )
 
@@ -346,46 +402,42 @@ class BaseCLI(ABC):
 
                     # Create internal result message (hidden from UI)
                     result_message = Message(
-                        id=str(uuid.uuid4()),
+                        id=new_message_id(),
                         project_id=project_path,
                         role="system",
                         message_type="result",
                         content=(
-                            f"Session completed in {getattr(message_obj, 'duration_ms', 0)}ms"
+                            f"Session completed in {duration_ms}ms"
                         ),
                         metadata_json={
-                            "cli_type": self.cli_type.value,
-                            "mode": "SDK",
-                            "duration_ms": getattr(
-                                message_obj, "duration_ms", 0
-                            ),
-                            "duration_api_ms": getattr(
-                                message_obj, "duration_api_ms", 0
-                            ),
-                            "total_cost_usd": getattr(
-                                message_obj, "total_cost_usd", 0
-                            ),
-                            "usage": str(getattr(message_obj, "usage", None)),
-                            "num_turns": getattr(message_obj, "num_turns", 0),
-                            "is_error": getattr(message_obj, "is_error", False),
-                            "subtype": getattr(message_obj, "subtype", None),
-                            "session_id": getattr(
-                                message_obj, "session_id", None
-                            ),
+                            **base_meta,
+                            "duration_ms": duration_ms,
+                            "duration_api_ms": fields.get("duration_api_ms", 0),
+                            "total_cost_usd": fields.get("total_cost_usd", 0),
+                            "usage": str(usage) if usage is not None else None,
+                            "num_turns": fields.get("num_turns", 0),
+                            "is_error": fields.get("is_error", False),
+                            "subtype": fields.get("subtype"),
+                            "session_id": fields.get("session_id"),
                             "hidden_from_ui": True,  # Don't show to user
                         },
                         session_id=session_id,
-                        created_at=datetime.utcnow(),
+                        created_at=message_timestamp(),
                     )
-                    yield result_message
+                    batch.append(result_message)
+                    yield batch
                     break
 
                 # Handle unknown message types
                 else:
-                    ui.debug(
-                        f"Unknown message type: {type(message_obj)}",
-                        "Claude Agent SDK",
-                    )
+                    if ui.debug_enabled:
+                        ui.debug(
+                            f"Unknown message type: {type(message_obj)}",
+                            "Claude Agent SDK",
+                        )
+
+                if batch:
+                    yield batch
 
     
     async def interrupt(self):
@@ -418,7 +470,7 @@ class BaseCLI(ABC):
                 "original_format": data,
             },
             session_id=session_id,
-            created_at=datetime.utcnow(),
+            created_at=message_timestamp(),
         )
 
     def _normalize_role(self, role: str) -> str:
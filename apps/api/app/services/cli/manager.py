@@ -12,6 +12,7 @@ import asyncio
 from app.core.terminal_ui import ui
 from app.core.websocket.manager import manager as ws_manager
 from app.models.messages import Message
+from app.models.sessions import Session as ChatSession
 from app.common.types import AgentType
 from app.services.cli.adapters import ClaudeAgentCLIAnalysis,ClaudeAgentFinAnalysis
 from app.services.cli.base import BaseCLI
@@ -122,6 +123,13 @@ class UnifiedSessionManager:
             ui.info(f"Session not found, creating new session: {session_id}")
             context = await self._create_session(session_id, project_id, cli_type, model)
 
+        # Contexts live only in memory and are lost on restart;
+        # pick the Claude session id back up from the sessions table
+        if context.claude_session_id is None:
+            chat_session = db.get(ChatSession, session_id)
+            if chat_session is not None:
+                context.claude_session_id = chat_session.claude_session_id
+
         # Add instruction to context history
         context.instructions.append(instruction)
         context.last_active_at = datetime.utcnow()
@@ -158,7 +166,7 @@ class UnifiedSessionManager:
         """Execute instruction with a specific CLI"""
 
         ui.info(f"Starting {cli.cli_type.value} execution", "CLI")
-        if model:
+        if model and ui.debug_enabled:
             ui.debug(f"Using model: {model}", "CLI")
 
         messages_collected: List[Message] = []
@@ -168,10 +176,16 @@ class UnifiedSessionManager:
 
         # Log callback
         def log_callback(message: Dict) -> Any:
-            self.session_context_map[session_id].claude_session_id = message.get("claude_session_id",None)
-            
+            claude_session_id = message.get("claude_session_id",None)
+            self.session_context_map[session_id].claude_session_id = claude_session_id
+            # Persist on the sessions row; committed together with the current message batch
+            if claude_session_id:
+                chat_session = db.get(ChatSession, session_id)
+                if chat_session is not None and chat_session.claude_session_id != claude_session_id:
+                    chat_session.claude_session_id = claude_session_id
+
 
-        async for message in cli.execute_with_streaming(
+        async for batch in cli.execute_with_streaming(
             instruction=instruction,
             project_id=project_id,
             session_id=session_id,
@@ -181,93 +195,96 @@ class UnifiedSessionManager:
             model=model,
             is_initial_prompt=is_initial_prompt,
         ):
-            # Check for error messages or result status
-            if message.message_type == "error":
-                has_error = True
-                ui.error(f"CLI error detected: {message.content[:100]}", "CLI")
-
-            # Check for result event (stored in metadata)
-            if message.metadata_json:
-                event_type = message.metadata_json.get("event_type")
-                original_event = message.metadata_json.get("original_event", {})
-
-                if event_type == "result" or original_event.get("type") == "result":
-                    # Check result event for success/error status
-                    is_error = original_event.get("is_error", False)
-                    subtype = original_event.get("subtype", "")
-
-                    # DEBUG: Log the complete result event structure
-                    ui.info(f"🔍 Result event received:", "DEBUG")
-                    ui.info(f"   Full event: {original_event}", "DEBUG")
-                    ui.info(f"   is_error: {is_error}", "DEBUG")
-                    ui.info(f"   subtype: '{subtype}'", "DEBUG")
-                    ui.info(f"   has event.result: {'result' in original_event}", "DEBUG")
-                    ui.info(f"   has event.status: {'status' in original_event}", "DEBUG")
-                    ui.info(f"   has event.success: {'success' in original_event}", "DEBUG")
-
-                    if is_error or subtype == "error":
-                        has_error = True
-                        result_success = False
-                        ui.error(
-                            f"Result: error (is_error={is_error}, subtype='{subtype}')",
-                            "CLI",
-                        )
-                    elif subtype == "success":
-                        result_success = True
-                        ui.success(
-                            f"Result: success (subtype='{subtype}')", "CLI"
-                        )
-                    else:
-                        # Handle case where subtype is not "success" but execution was successful
-                        ui.warning(
-                            f"Result: no explicit success subtype (subtype='{subtype}', is_error={is_error})",
-                            "CLI",
-                        )
-                        # If there's no error indication, assume success
-                        if not is_error:
+            for message in batch:
+                # Check for error messages or result status
+                if message.message_type == "error":
+                    has_error = True
+                    ui.error(f"CLI error detected: {message.content[:100]}", "CLI")
+
+                # Check for result event (stored in metadata)
+                if message.metadata_json:
+                    event_type = message.metadata_json.get("event_type")
+                    original_event = message.metadata_json.get("original_event", {})
+
+                    if event_type == "result" or original_event.get("type") == "result":
+                        # Check result event for success/error status
+                        is_error = original_event.get("is_error", False)
+                        subtype = original_event.get("subtype", "")
+
+                        # DEBUG: Log the complete result event structure (only with DEBUG=true)
+                        if ui.debug_enabled:
+                            ui.debug(f"🔍 Result event received:", "CLI")
+                            ui.debug(f"   Full event: {original_event}", "CLI")
+                            ui.debug(f"   is_error: {is_error}", "CLI")
+                            ui.debug(f"   subtype: '{subtype}'", "CLI")
+                            ui.debug(f"   has event.result: {'result' in original_event}", "CLI")
+                            ui.debug(f"   has event.status: {'status' in original_event}", "CLI")
+                            ui.debug(f"   has event.success: {'success' in original_event}", "CLI")
+
+                        if is_error or subtype == "error":
+                            has_error = True
+                            result_success = False
+                            ui.error(
+                                f"Result: error (is_error={is_error}, subtype='{subtype}')",
+                                "CLI",
+                            )
+                        elif subtype == "success":
                             result_success = True
                             ui.success(
-                                f"Result: assuming success (no error detected)", "CLI"
+                                f"Result: success (subtype='{subtype}')", "CLI"
+                            )
+                        else:
+                            # Handle case where subtype is not "success" but execution was successful
+                            ui.warning(
+                                f"Result: no explicit success subtype (subtype='{subtype}', is_error={is_error})",
+                                "CLI",
                             )
+                            # If there's no error indication, assume success
+                            if not is_error:
+                                result_success = True
+                                ui.success(
+                                    f"Result: assuming success (no error detected)", "CLI"
+                                )
+
+                # Save message to database (committed once per batch below)
+                message.project_id = project_id
+                message.conversation_id = conversation_id
+                db.add(message)
+                messages_collected.append(message)
 
-            # Save message to database
-            message.project_id = project_id
-            message.conversation_id = conversation_id
-            db.add(message)
             db.commit()
 
-            messages_collected.append(message)
-
-            # Check if message should be hidden from UI
-            should_hide = (
-                message.metadata_json and message.metadata_json.get("hidden_from_ui", False)
-            )
-
-            # Send message via WebSocket only if not hidden
-            if not should_hide:
-                ws_message = {
-                    "type": "message",
-                    "data": {
-                        "id": message.id,
-                        "role": message.role,
-                        "message_type": message.message_type,
-                        "content": message.content,
-                        "metadata_json": message.metadata_json,
-                        "parent_message_id": getattr(message, "parent_message_id", None),
-                        "session_id": message.session_id,
-                        "conversation_id": conversation_id,
-                        "created_at": message.created_at.isoformat(),
-                    },
-                    "timestamp": message.created_at.isoformat(),
-                }
-                try:
-                    await ws_manager.send_message(project_id, ws_message)
-                except Exception as e:
-                    ui.error(f"WebSocket send failed: {e}", "Message")
-
-            # Check if changes were made
-            if message.metadata_json and "changes_made" in message.metadata_json:
-                has_changes = True
+            for message in batch:
+                # Check if message should be hidden from UI
+                should_hide = (
+                    message.metadata_json and message.metadata_json.get("hidden_from_ui", False)
+                )
+
+                # Send message via WebSocket only if not hidden
+                if not should_hide:
+                    ws_message = {
+                        "type": "message",
+                        "data": {
+                            "id": message.id,
+                            "role": message.role,
+                            "message_type": message.message_type,
+                            "content": message.content,
+                            "metadata_json": message.metadata_json,
+                            "parent_message_id": getattr(message, "parent_message_id", None),
+                            "session_id": message.session_id,
+                            "conversation_id": conversation_id,
+                            "created_at": message.created_at.isoformat(),
+                        },
+                        "timestamp": message.created_at.isoformat(),
+                    }
+                    try:
+                        await ws_manager.send_message(project_id, ws_message)
+                    except Exception as e:
+                        ui.error(f"WebSocket send failed: {e}", "Message")
+
+                # Check if changes were made
+                if message.metadata_json and "changes_made" in message.metadata_json:
+                    has_changes = True
 
         # Determine final success status
         # Check has_error to determine success
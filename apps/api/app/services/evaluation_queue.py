@@ -0,0 +1,70 @@
+"""
+Bounded evaluation worker pool
+
+Evaluation jobs are queued and executed by a fixed number of worker tasks, so a burst
+of evaluation requests cannot saturate the event loop or the model API quota.
+"""
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+EvaluationJob = Callable[[], Awaitable[None]]
+
+
+class EvaluationQueue:
+    """Producer-consumer queue running evaluation jobs with bounded concurrency"""
+
+    def __init__(self, concurrency: int, max_queue: int):
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(1, max_queue)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start worker tasks on the running event loop (idempotent)"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"evaluation-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        ui.info(f"Started {self.concurrency} evaluation workers", "Evaluation Queue")
+
+    async def stop(self) -> None:
+        """Cancel worker tasks"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def submit(self, job: EvaluationJob) -> bool:
+        """Queue a job; returns False when the queue is full"""
+        self.start()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Number of queued jobs not yet picked up by a worker"""
+        return self._queue.qsize() if self._queue else 0
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await job()
+            except Exception as e:
+                # Jobs record their own failures; never let one kill the worker
+                ui.error(f"Evaluation worker {index} job failed: {e}", "Evaluation Queue")
+            finally:
+                self._queue.task_done()
+
+
+evaluation_queue = EvaluationQueue(settings.eval_concurrency, settings.eval_max_queue)
@@ -0,0 +1,149 @@
+"""
+Evaluation state storage
+
+Stores evaluation task state (status, progress, scores, report) so that it can be
+shared between uvicorn workers. Uses a Redis hash per evaluation when REDIS_URL is
+configured, otherwise falls back to an in-process dict for the local dev server.
+"""
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis is optional for local development
+    redis_asyncio = None
+
+# Evaluation state is kept for 24 hours
+EVALUATION_TTL_SECONDS = 24 * 60 * 60
+_KEY_PREFIX = "eval:"
+_CHANNEL_PREFIX = "eval-events:"
+
+# Statuses after which an evaluation no longer changes
+FINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+class EvaluationStore:
+    """Evaluation state store backed by Redis or an in-process dict"""
+
+    def __init__(self, redis_url: str = ""):
+        self._redis = None
+        self._local: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        # In-process subscribers waiting for change notifications
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+        if redis_url:
+            if redis_asyncio is None:
+                ui.warning("REDIS_URL is set but redis is not installed, using in-memory store", "Evaluation Store")
+            else:
+                self._redis = redis_asyncio.from_url(redis_url, decode_responses=True)
+
+    async def create(self, evaluation_id: str, state: Dict[str, Any]) -> None:
+        """Create the state of a new evaluation"""
+        if self._redis is None:
+            self._purge_expired()
+            self._local[evaluation_id] = (time.monotonic() + EVALUATION_TTL_SECONDS, dict(state))
+            return
+
+        key = _KEY_PREFIX + evaluation_id
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=_encode(state))
+            pipe.expire(key, EVALUATION_TTL_SECONDS)
+            await pipe.execute()
+
+    async def update(self, evaluation_id: str, **fields: Any) -> None:
+        """Update fields of an existing evaluation"""
+        if self._redis is None:
+            entry = self._local.get(evaluation_id)
+            if entry is not None:
+                entry[1].update(fields)
+            for queue in self._subscribers.get(evaluation_id, ()):
+                queue.put_nowait(None)
+            return
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(_KEY_PREFIX + evaluation_id, mapping=_encode(fields))
+            pipe.publish(_CHANNEL_PREFIX + evaluation_id, "1")
+            await pipe.execute()
+
+    async def get(self, evaluation_id: str) -> Optional[Dict[str, Any]]:
+        """Get evaluation state, or None if unknown or expired"""
+        if self._redis is None:
+            entry = self._local.get(evaluation_id)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return dict(entry[1])
+
+        raw = await self._redis.hgetall(_KEY_PREFIX + evaluation_id)
+        if not raw:
+            return None
+        return {field: json.loads(value) for field, value in raw.items()}
+
+    async def watch(
+        self, evaluation_id: str, heartbeat: float = 15.0
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield the evaluation state now and after every update until it is final
+
+        Yields None when no update arrived within ``heartbeat`` seconds, so callers
+        can keep idle connections alive. Stops if the evaluation is unknown.
+        """
+        if self._redis is None:
+            queue: asyncio.Queue = asyncio.Queue()
+            self._subscribers.setdefault(evaluation_id, set()).add(queue)
+            try:
+                async for state in self._watch_states(evaluation_id, heartbeat, queue.get):
+                    yield state
+            finally:
+                subscribers = self._subscribers.get(evaluation_id)
+                if subscribers is not None:
+                    subscribers.discard(queue)
+                    if not subscribers:
+                        del self._subscribers[evaluation_id]
+            return
+
+        pubsub = self._redis.pubsub()
+        # Subscribe before reading the initial state so no update is missed
+        await pubsub.subscribe(_CHANNEL_PREFIX + evaluation_id)
+
+        async def next_message() -> None:
+            while await pubsub.get_message(ignore_subscribe_messages=True, timeout=None) is None:
+                pass
+
+        try:
+            async for state in self._watch_states(evaluation_id, heartbeat, next_message):
+                yield state
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def _watch_states(self, evaluation_id: str, heartbeat: float, wait_for_update):
+        state = await self.get(evaluation_id)
+        while state is not None:
+            yield state
+            if state.get("status") in FINAL_STATUSES:
+                return
+            while True:
+                try:
+                    await asyncio.wait_for(wait_for_update(), timeout=heartbeat)
+                    break
+                except asyncio.TimeoutError:
+                    yield None
+            state = await self.get(evaluation_id)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for evaluation_id in [k for k, (expires, _) in self._local.items() if expires <= now]:
+            del self._local[evaluation_id]
+
+
+def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+    # Hash values are strings; JSON-encode each field to keep types (None, int, list)
+    return {field: json.dumps(value, ensure_ascii=False) for field, value in fields.items()}
+
+
+evaluation_store = EvaluationStore(settings.redis_url)
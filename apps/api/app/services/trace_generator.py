@@ -8,11 +8,12 @@ Supports both Markdown (for LLM evaluation) and JSON (for programmatic analysis)
 import sqlite3
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Literal, Union
+from typing import Iterator, List, Dict, Any, Optional, Literal, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass, asdict
 import re
 from sqlalchemy.orm import Session
+import orjson
 
 
 @dataclass
@@ -92,13 +93,25 @@ class TraceGenerator:
             self.cursor = self.conn.cursor()
             self.using_sqlalchemy = False
 
+        # Messages loaded per project; generate_trace_files renders the same
+        # messages several times, so they are read from the database only once
+        self._messages_cache: Dict[str, List[Dict[str, Any]]] = {}
+
     def close(self):
         """Close database connection (only for SQLite mode)"""
         if self.conn:
             self.conn.close()
 
     def get_project_messages(self, project_id: str) -> List[Dict[str, Any]]:
-        """Get all messages for a project"""
+        """Get all messages for a project (cached per generator instance)"""
+        messages = self._messages_cache.get(project_id)
+        if messages is None:
+            messages = self._load_project_messages(project_id)
+            self._messages_cache[project_id] = messages
+        return messages
+
+    def _load_project_messages(self, project_id: str) -> List[Dict[str, Any]]:
+        """Load all messages for a project from the database"""
         if self.using_sqlalchemy:
             # Use SQLAlchemy ORM
             from app.models.messages import Message
@@ -538,26 +551,50 @@ class TraceGenerator:
         if not messages:
             return {"error": "No messages found"}
 
+        trace, outcome = self._build_json_sections(messages)
+        trace['timeline'] = [
+            self._build_timeline_entry(i, msg, include_full_output)
+            for i, msg in enumerate(messages)
+        ]
+        trace['outcome'] = outcome
+        return trace
+
+    def generate_json_stream(
+        self,
+        project_id: str,
+        include_full_output: bool = False
+    ) -> Iterator[bytes]:
+        """
+        Generate JSON format trace as a stream of byte chunks
+
+        Produces the same document as generate_json, but timeline entries are
+        serialized one at a time instead of materializing the whole trace.
+        Messages are loaded eagerly, so the session may be closed before the
+        returned iterator is consumed.
+        """
+        messages = self.get_project_messages(project_id)
+        if not messages:
+            return iter([orjson.dumps({"error": "No messages found"})])
+        return self._iter_json_chunks(messages, include_full_output)
+
+    def _iter_json_chunks(self, messages: List[Dict], include_full_output: bool) -> Iterator[bytes]:
+        trace, outcome = self._build_json_sections(messages)
+
+        # Header object without its closing brace, then the timeline array
+        yield orjson.dumps(trace)[:-1] + b',"timeline":['
+        for i, msg in enumerate(messages):
+            entry = orjson.dumps(self._build_timeline_entry(i, msg, include_full_output))
+            yield entry if i == 0 else b',' + entry
+        yield b'],"outcome":' + orjson.dumps(outcome) + b'}'
+
+    def _build_json_sections(self, messages: List[Dict]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build the JSON trace fields before the timeline and the outcome section"""
         metadata = self.extract_metadata(messages)
         stats = self.calculate_statistics(messages)
         user_queries = self.extract_user_queries(messages)
+
         final_response = self.extract_final_response(messages)
 
-        # Build timeline
-        timeline = []
-        for i, msg in enumerate(messages):
-            timeline_entry = {
-                'index': i + 1,
-                'timestamp': msg['created_at'],
-                'type': f"{msg['role']}_{msg['message_type']}",
-                'role': msg['role'],
-                'message_type': msg['message_type'],
-                'content': msg['content'] if include_full_output else msg['content'][:500],
-                'metadata': msg['metadata']
-            }
-            timeline.append(timeline_entry)
-
-        # Build JSON structure
         trace = {
             'trace_version': '1.0',
             'generated_at': datetime.utcnow().isoformat(),
@@ -571,17 +608,27 @@ class TraceGenerator:
             },
 
             'statistics': asdict(stats),
+        }
 
-            'timeline': timeline,
-
-            'outcome': {
-                'success': stats.errors == 0,
-                'final_response': final_response,
-                'errors': stats.errors
-            }
+        outcome = {
+            'success': stats.errors == 0,
+            'final_response': final_response,
+            'errors': stats.errors
         }
 
-        return trace
+        return trace, outcome
+
+    def _build_timeline_entry(self, i: int, msg: Dict, include_full_output: bool) -> Dict[str, Any]:
+        """Build a single JSON timeline entry"""
+        return {
+            'index': i + 1,
+            'timestamp': msg['created_at'],
+            'type': f"{msg['role']}_{msg['message_type']}",
+            'role': msg['role'],
+            'message_type': msg['message_type'],
+            'content': msg['content'] if include_full_output else msg['content'][:500],
+            'metadata': msg['metadata']
+        }
 
     def generate_trace_files(
         self,
@@ -3,6 +3,7 @@
 用于解析和验证客户端证书指纹
 """
 import base64
+import functools
 import hashlib
 import logging
 
@@ -13,6 +14,7 @@ def get_md5_cert(cert: str | None) -> str | None:
     """
     获取证书指纹（MD5哈希值）
     与 CRM 统计平台保持一致的实现
+    同一客户端每次请求携带相同证书，结果按去除首尾空白后的证书字符串缓存
 
     Args:
         cert: 证书字符串（PEM 格式）
@@ -28,6 +30,11 @@ def get_md5_cert(cert: str | None) -> str | None:
     if cert is None:
         return None
 
+    return _get_md5_cert_cached(cert.strip())
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_md5_cert_cached(cert: str) -> str | None:
     try:
         # 清理证书字符串
         # 处理转义的换行符（HTTP 头部中可能使用 \\n）